@@ -4,12 +4,18 @@ from __future__ import annotations
 
 import json
 import re
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, BinaryIO, Iterator
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json is the fallback
+    orjson = None
+
 _EXAM_PATTERN = re.compile(r"\b(midterm|final|exam)\b", re.IGNORECASE)
 _QUIZ_PATTERN = re.compile(r"\bquiz\b", re.IGNORECASE)
 _DEFAULT_TIMEOUT_SECONDS = 20
@@ -43,8 +49,8 @@ def _request_json(*, url: str, token: str, user_agent: str) -> tuple[Any, dict[s
     )
     try:
         with urlopen(req, timeout=_DEFAULT_TIMEOUT_SECONDS) as resp:
-            raw = resp.read().decode("utf-8")
-            payload = json.loads(raw)
+            raw = resp.read()
+            payload = orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
             headers = {k.lower(): v for k, v in resp.headers.items()}
             return payload, headers
     except HTTPError as exc:  # pragma: no cover - network path
@@ -280,8 +286,9 @@ def fetch_course_files(
     return items
 
 
-def fetch_file_bytes(*, url: str, token: str, user_agent: str) -> tuple[bytes, str]:
-    """Fetch file bytes and return `(payload, content_type)`."""
+@contextmanager
+def open_file_stream(*, url: str, token: str, user_agent: str) -> Iterator[tuple[BinaryIO, str]]:
+    """Open a file download and yield `(response, content_type)` without reading the body."""
     req = Request(
         url=url,
         headers={
@@ -292,12 +299,19 @@ def fetch_file_bytes(*, url: str, token: str, user_agent: str) -> tuple[bytes, s
         method="GET",
     )
     try:
-        with urlopen(req, timeout=_DEFAULT_TIMEOUT_SECONDS) as resp:
-            content_type = str(resp.headers.get("Content-Type", "")).strip().lower()
-            payload = resp.read()
-            return payload, content_type
+        resp = urlopen(req, timeout=_DEFAULT_TIMEOUT_SECONDS)
     except HTTPError as exc:  # pragma: no cover - network path
         detail = exc.read().decode("utf-8", errors="ignore")
         raise CanvasApiError(f"canvas file request failed ({exc.code}) for {url}: {detail}") from exc
     except URLError as exc:  # pragma: no cover - network path
         raise CanvasApiError(f"canvas file request failed for {url}: {exc.reason}") from exc
+
+    with resp:
+        content_type = str(resp.headers.get("Content-Type", "")).strip().lower()
+        yield resp, content_type
+
+
+def fetch_file_bytes(*, url: str, token: str, user_agent: str) -> tuple[bytes, str]:
+    """Fetch file bytes and return `(payload, content_type)`."""
+    with open_file_stream(url=url, token=token, user_agent=user_agent) as (resp, content_type):
+        return resp.read(), content_type
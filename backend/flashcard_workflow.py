@@ -5,30 +5,42 @@ from __future__ import annotations
 import json
 import logging
 import os
-from datetime import datetime, timezone
+import time
+from functools import lru_cache
 from typing import Any, Mapping
 
 logger = logging.getLogger(__name__)
 
 
 def _utc_now_rfc3339() -> str:
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
-def _docs_table() -> Any:
+@lru_cache(maxsize=1)
+def _dynamodb_resource() -> Any:
+    # Built once per container so warm invocations skip botocore's service-model loading.
     import boto3
+
+    return boto3.resource("dynamodb")
+
+
+@lru_cache(maxsize=4)
+def _dynamodb_table(table_name: str) -> Any:
+    return _dynamodb_resource().Table(table_name)
+
+
+def _docs_table() -> Any:
     table_name = os.getenv("DOCS_TABLE", "").strip()
     if not table_name:
         raise RuntimeError("server misconfiguration: DOCS_TABLE missing")
-    return boto3.resource("dynamodb").Table(table_name)
+    return _dynamodb_table(table_name)
 
 
 def _cards_table() -> Any:
-    import boto3
     table_name = os.getenv("CARDS_TABLE", "").strip()
     if not table_name:
         raise RuntimeError("server misconfiguration: CARDS_TABLE missing")
-    return boto3.resource("dynamodb").Table(table_name)
+    return _dynamodb_table(table_name)
 
 
 def worker_handler(event: Mapping[str, Any], _context: Any) -> dict[str, Any]:
@@ -6,10 +6,16 @@ import json
 import logging
 import os
 import re
-from datetime import datetime, timezone
+import time
+from functools import lru_cache
 from typing import Any
 from urllib.parse import unquote, urlparse
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json is the fallback
+    orjson = None
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
@@ -60,11 +66,25 @@ _CHEATING_PATTERNS = (
         re.IGNORECASE,
     ),
 )
+_TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+
+
+def _encode_model_body(body: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(body)
+    return json.dumps(body).encode("utf-8")
+
+
+def _decode_model_body(raw: bytes) -> Any:
+    # Bedrock response bodies are strict JSON, so orjson can parse the raw bytes directly.
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
 
 
 def _remove_trailing_commas(value: str) -> str:
     """Remove trailing commas before JSON object/array closers."""
-    return re.sub(r",\s*([}\]])", r"\1", value)
+    return _TRAILING_COMMA_PATTERN.sub(r"\1", value)
 
 
 def _extract_balanced_json_fragment(text: str, opener: str, closer: str) -> str | None:
@@ -184,20 +204,30 @@ def _require_env(name: str) -> str:
     return value
 
 
+# Clients are built once per container; botocore loads and parses the service model on construction.
+@lru_cache(maxsize=1)
 def _bedrock_agent_runtime() -> Any:
     import boto3
 
     return boto3.client("bedrock-agent-runtime")
 
 
+@lru_cache(maxsize=1)
 def _bedrock_runtime() -> Any:
     import boto3
 
     return boto3.client("bedrock-runtime")
 
 
+@lru_cache(maxsize=1)
+def _s3_client() -> Any:
+    import boto3
+
+    return boto3.client("s3")
+
+
 def _utc_now_rfc3339() -> str:
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
 def guardrail_blocked_chat_response() -> dict[str, Any]:
@@ -469,7 +499,7 @@ def _invoke_model_json(
             "modelId": model_id,
             "contentType": "application/json",
             "accept": "application/json",
-            "body": json.dumps(body).encode("utf-8"),
+            "body": _encode_model_body(body),
         }
         guardrail_id, guardrail_version = _guardrail_settings()
         if guardrail_id and guardrail_version:
@@ -480,7 +510,7 @@ def _invoke_model_json(
         raise GenerationError(f"model invocation failed: {exc}") from exc
 
     try:
-        payload = json.loads(response["body"].read().decode("utf-8"))
+        payload = _decode_model_body(response["body"].read())
     except (json.JSONDecodeError, KeyError, AttributeError) as exc:
         raise GenerationError("model returned unreadable response") from exc
 
@@ -539,7 +569,7 @@ def _invoke_model_multimodal_json(
             "modelId": model_id,
             "contentType": "application/json",
             "accept": "application/json",
-            "body": json.dumps(body).encode("utf-8"),
+            "body": _encode_model_body(body),
         }
         guardrail_id, guardrail_version = _guardrail_settings()
         if guardrail_id and guardrail_version:
@@ -550,7 +580,7 @@ def _invoke_model_multimodal_json(
         raise GenerationError(f"model invocation failed: {exc}") from exc
 
     try:
-        payload = json.loads(response["body"].read().decode("utf-8"))
+        payload = _decode_model_body(response["body"].read())
     except (json.JSONDecodeError, KeyError, AttributeError) as exc:
         raise GenerationError("model returned unreadable response") from exc
 
@@ -581,8 +611,6 @@ def generate_flashcards_from_materials(
     """Generate flashcards by sending material files directly to Claude as multimodal document blocks."""
     import base64
 
-    import boto3
-
     if not material_s3_keys:
         raise GenerationError("no materials provided for flashcard generation")
 
@@ -590,7 +618,7 @@ def generate_flashcards_from_materials(
     if not bucket:
         raise GenerationError("server misconfiguration: UPLOADS_BUCKET missing")
 
-    s3 = boto3.client("s3")
+    s3 = _s3_client()
     content_blocks: list[dict[str, Any]] = []
 
     for s3_key in material_s3_keys:
@@ -772,13 +800,11 @@ def generate_practice_exam_from_materials(
 
     import base64
 
-    import boto3
-
     bucket = os.getenv("UPLOADS_BUCKET", "").strip()
     if not bucket:
         raise GenerationError("server misconfiguration: UPLOADS_BUCKET missing")
 
-    s3 = boto3.client("s3")
+    s3 = _s3_client()
     content_blocks: list[dict[str, Any]] = []
 
     for s3_key in material_s3_keys:
@@ -1264,7 +1290,7 @@ def chat_answer_with_actions(
             "modelId": model_id,
             "contentType": "application/json",
             "accept": "application/json",
-            "body": json.dumps(body).encode("utf-8"),
+            "body": _encode_model_body(body),
         }
         guardrail_id, guardrail_version = _guardrail_settings()
         if guardrail_id and guardrail_version:
@@ -1275,7 +1301,7 @@ def chat_answer_with_actions(
         raise GenerationError(f"chat model invocation failed: {exc}") from exc
 
     try:
-        payload = json.loads(response["body"].read().decode("utf-8"))
+        payload = _decode_model_body(response["body"].read())
     except (json.JSONDecodeError, KeyError, AttributeError) as exc:
         raise GenerationError("model returned unreadable response") from exc
 
@@ -11,8 +11,9 @@ import subprocess
 import tempfile
 import time
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Iterator, Mapping
 
 logger = logging.getLogger(__name__)
 MAX_OFFICE_DOC_BYTES = 50 * 1024 * 1024
@@ -26,7 +27,7 @@ _METRIC_KB_TRIGGER_FAILED = "IngestKbTriggerFailed"
 
 
 def _utc_now_rfc3339() -> str:
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
 def _parse_event(event: Mapping[str, Any]) -> dict[str, Any]:
@@ -35,33 +36,49 @@ def _parse_event(event: Mapping[str, Any]) -> dict[str, Any]:
     return dict(event)
 
 
+# Clients and the DynamoDB resource are built once per container; warm invocations skip
+# botocore's service-model loading. Table names are still read from the env on every call.
+@lru_cache(maxsize=1)
 def _s3_client() -> Any:
     import boto3
 
     return boto3.client("s3")
 
 
+@lru_cache(maxsize=1)
 def _textract_client() -> Any:
     import boto3
 
     return boto3.client("textract")
 
 
-def _dynamodb_table() -> Any:
+@lru_cache(maxsize=1)
+def _dynamodb_resource() -> Any:
     import boto3
 
+    return boto3.resource("dynamodb")
+
+
+@lru_cache(maxsize=4)
+def _dynamodb_table_named(table_name: str) -> Any:
+    return _dynamodb_resource().Table(table_name)
+
+
+def _dynamodb_table() -> Any:
     table_name = os.getenv("DOCS_TABLE", "").strip()
     if not table_name:
         raise RuntimeError("server misconfiguration: DOCS_TABLE missing")
-    return boto3.resource("dynamodb").Table(table_name)
+    return _dynamodb_table_named(table_name)
 
 
+@lru_cache(maxsize=1)
 def _bedrock_agent_client() -> Any:
     import boto3
 
     return boto3.client("bedrock-agent")
 
 
+@lru_cache(maxsize=1)
 def _cloudwatch_client() -> Any:
     import boto3
 
@@ -230,13 +247,39 @@ def _extract_text_with_pymupdf(data: bytes, key: str) -> str:
     except Exception:
         return ""
 
-    text_parts: list[str] = []
     with fitz.open(stream=data, filetype="pdf") as document:
-        for page in document:
-            text_parts.append(page.get_text("text") or "")
+        return _pdf_document_text(document)
+
+
+def _pdf_document_text(document: Any) -> str:
+    text_parts: list[str] = []
+    for page in document:
+        text_parts.append(page.get_text("text") or "")
     return "\n".join(text_parts).strip()
 
 
+def _download_s3_to_path(bucket: str, key: str, path: Path) -> None:
+    _s3_client().download_file(bucket, key, str(path))
+
+
+def _extract_pdf_text_from_s3(bucket: str, key: str) -> str:
+    """Extract text from a native PDF without buffering the whole object in memory.
+
+    boto3's transfer manager streams the object to /tmp with concurrent ranged GETs and
+    PyMuPDF opens the file from disk, loading pages lazily.
+    """
+    try:
+        import fitz  # type: ignore
+    except Exception:
+        return ""
+
+    with tempfile.TemporaryDirectory(dir="/tmp") as tmp_dir:
+        pdf_path = Path(tmp_dir) / "source.pdf"
+        _download_s3_to_path(bucket, key, pdf_path)
+        with fitz.open(str(pdf_path), filetype="pdf") as document:
+            return _pdf_document_text(document)
+
+
 def _persist_status(
     *,
     job_id: str,
@@ -247,8 +290,9 @@ def _persist_status(
     text: str = "",
     used_textract: bool = False,
     error: str = "",
+    now: str | None = None,
 ) -> None:
-    now = _utc_now_rfc3339()
+    now = now or _utc_now_rfc3339()
     _dynamodb_table().put_item(
         Item={
             "docId": job_id,
@@ -271,10 +315,11 @@ def _persist_kb_ingestion_result(
     *,
     ingestion_job_id: str | None = None,
     ingestion_error: str | None = None,
+    now: str | None = None,
 ) -> None:
     """Update the ingest job row with KB ingestion job id or error for traceability."""
     table = _dynamodb_table()
-    now = _utc_now_rfc3339()
+    now = now or _utc_now_rfc3339()
     updates: list[str] = ["kbIngestionUpdatedAt = :now"]
     values: dict[str, Any] = {":now": now}
     if ingestion_job_id is not None:
@@ -298,24 +343,30 @@ def extract_handler(event: Mapping[str, Any], _context: Any) -> dict[str, Any]:
     if not bucket or not key:
         raise ValueError("bucket and key are required")
 
-    data = _read_s3_bytes(bucket, key)
-    extraction_key = key
     textract_key = key
-    if _is_pptx_key(key) or _is_docx_key(key) or _is_doc_key(key):
-        if len(data) > MAX_OFFICE_DOC_BYTES:
-            extension = ".pptx" if _is_pptx_key(key) else ".docx" if _is_docx_key(key) else ".doc"
-            raise ValueError(f"'{extension}' exceeds 50MB limit")
-        converted_pdf = (
-            _convert_pptx_to_pdf(data)
-            if _is_pptx_key(key)
-            else _convert_docx_to_pdf(data) if _is_docx_key(key) else _convert_doc_to_pdf(data)
-        )
-        converted_key = _converted_pdf_key(key)
-        _write_s3_bytes(bucket, converted_key, converted_pdf, content_type="application/pdf")
-        extraction_key = converted_key
-        textract_key = converted_key
+    if key.lower().endswith(".pdf"):
+        # Native PDFs need no conversion, so skip buffering the object in memory.
+        text = _extract_pdf_text_from_s3(bucket, key)
+    else:
+        data = _read_s3_bytes(bucket, key)
+        extraction_data = data
+        extraction_key = key
+        if _is_pptx_key(key) or _is_docx_key(key) or _is_doc_key(key):
+            if len(data) > MAX_OFFICE_DOC_BYTES:
+                extension = ".pptx" if _is_pptx_key(key) else ".docx" if _is_docx_key(key) else ".doc"
+                raise ValueError(f"'{extension}' exceeds 50MB limit")
+            converted_pdf = (
+                _convert_pptx_to_pdf(data)
+                if _is_pptx_key(key)
+                else _convert_docx_to_pdf(data) if _is_docx_key(key) else _convert_doc_to_pdf(data)
+            )
+            converted_key = _converted_pdf_key(key)
+            _write_s3_bytes(bucket, converted_key, converted_pdf, content_type="application/pdf")
+            extraction_data = converted_pdf
+            extraction_key = converted_key
+            textract_key = converted_key
+        text = _extract_text_with_pymupdf(extraction_data, extraction_key)
 
-    text = _extract_text_with_pymupdf(data if extraction_key == key else converted_pdf, extraction_key)
     return {
         **payload,
         "text": text,
@@ -343,6 +394,21 @@ def start_textract_handler(event: Mapping[str, Any], _context: Any) -> dict[str,
     }
 
 
+def _iter_textract_pages(client: Any, job_id: str, first_page: Mapping[str, Any]) -> Iterator[Mapping[str, Any]]:
+    """Yield Textract result pages, following NextToken from an already-fetched first page.
+
+    Textract does not ship a boto3 paginator for GetDocumentTextDetection, so the
+    NextToken walk lives here instead of being repeated per caller.
+    """
+    page = first_page
+    while True:
+        yield page
+        next_token = page.get("NextToken")
+        if not next_token:
+            return
+        page = client.get_document_text_detection(JobId=job_id, NextToken=next_token)
+
+
 def poll_textract_handler(event: Mapping[str, Any], _context: Any) -> dict[str, Any]:
     payload = _parse_event(event)
     job_id = str(payload.get("textractJobId", "")).strip()
@@ -362,19 +428,12 @@ def poll_textract_handler(event: Mapping[str, Any], _context: Any) -> dict[str,
             "error": f"textract job {job_id} ended with status {status}",
         }
 
-    lines: list[str] = []
-    next_token = response.get("NextToken")
-    for block in response.get("Blocks", []):
-        if block.get("BlockType") == "LINE" and isinstance(block.get("Text"), str):
-            lines.append(block["Text"])
-
-    while next_token:
-        response = client.get_document_text_detection(JobId=job_id, NextToken=next_token)
-        for block in response.get("Blocks", []):
-            if block.get("BlockType") == "LINE" and isinstance(block.get("Text"), str):
-                lines.append(block["Text"])
-        next_token = response.get("NextToken")
-
+    lines = [
+        block["Text"]
+        for page in _iter_textract_pages(client, job_id, response)
+        for block in page.get("Blocks", ())
+        if block.get("BlockType") == "LINE" and isinstance(block.get("Text"), str)
+    ]
     text = "\n".join(lines).strip()
     return {
         **payload,
@@ -398,6 +457,8 @@ def finalize_handler(event: Mapping[str, Any], _context: Any) -> dict[str, Any]:
     text = str(payload.get("text", ""))
     used_textract = bool(payload.get("usedTextract", False))
     status = "FAILED" if error else "FINISHED"
+    # One timestamp per invocation so the status row, KB result and response agree.
+    now = _utc_now_rfc3339()
 
     _persist_status(
         job_id=job_id,
@@ -408,6 +469,7 @@ def finalize_handler(event: Mapping[str, Any], _context: Any) -> dict[str, Any]:
         text=text,
         used_textract=used_textract,
         error=error,
+        now=now,
     )
 
     if status == "FINISHED":
@@ -420,10 +482,11 @@ def finalize_handler(event: Mapping[str, Any], _context: Any) -> dict[str, Any]:
             )
             logger.error(err_msg)
             _emit_operational_metric(_METRIC_KB_TRIGGER_MISSING_CONFIG)
-            _persist_kb_ingestion_result(job_id, ingestion_error=err_msg)
+            _persist_kb_ingestion_result(job_id, ingestion_error=err_msg, now=now)
         else:
-            client_token = hashlib.sha256(
-                f"{source_key}:{len(text)}".encode()
+            # Bedrock requires clientToken to be 33-256 chars; a 32-byte digest gives 64 hex chars.
+            client_token = hashlib.blake2b(
+                f"{source_key}:{len(text)}".encode(), digest_size=32
             ).hexdigest()
             _emit_operational_metric(_METRIC_KB_TRIGGER_STARTED)
             try:
@@ -439,12 +502,12 @@ def finalize_handler(event: Mapping[str, Any], _context: Any) -> dict[str, Any]:
                     job_id,
                     ingestion_job_id,
                 )
-                _persist_kb_ingestion_result(job_id, ingestion_job_id=ingestion_job_id)
+                _persist_kb_ingestion_result(job_id, ingestion_job_id=ingestion_job_id, now=now)
             except Exception as exc:  # noqa: BLE001
                 _emit_operational_metric(_METRIC_KB_TRIGGER_FAILED)
                 err_msg = f"KB ingestion trigger failed: {exc}"
                 logger.exception(err_msg)
-                _persist_kb_ingestion_result(job_id, ingestion_error=err_msg)
+                _persist_kb_ingestion_result(job_id, ingestion_error=err_msg, now=now)
     else:
         _emit_operational_metric(_METRIC_FINALIZE_FAILURE)
 
@@ -453,7 +516,7 @@ def finalize_handler(event: Mapping[str, Any], _context: Any) -> dict[str, Any]:
         "status": status,
         "textLength": len(text),
         "usedTextract": used_textract,
-        "updatedAt": _utc_now_rfc3339(),
+        "updatedAt": now,
         "error": error,
     }
 
@@ -7,9 +7,15 @@ import os
 import re
 import uuid
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Callable, Dict, Mapping, Protocol
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json is the fallback
+    orjson = None
+
 ALLOWED_CONTENT_TYPES = frozenset(
     {
         "application/pdf",
@@ -171,7 +177,7 @@ def _build_json_response(status_code: int, payload: Mapping[str, Any]) -> Dict[s
             "Access-Control-Allow-Methods": methods,
             "Access-Control-Allow-Headers": allow_headers,
         },
-        "body": json.dumps(payload),
+        "body": orjson.dumps(payload).decode("utf-8") if orjson is not None else json.dumps(payload),
     }
 
 
@@ -180,15 +186,16 @@ def _load_json_body(event: Mapping[str, Any]) -> Mapping[str, Any]:
     if isinstance(body, dict):
         return body
     if isinstance(body, str):
-        parsed = json.loads(body)
+        parsed = orjson.loads(body) if orjson is not None else json.loads(body)
         if not isinstance(parsed, dict):
             raise UploadValidationError("request body must be a JSON object")
         return parsed
     raise UploadValidationError("request body must be a JSON object")
 
 
+@lru_cache(maxsize=1)
 def create_default_s3_client() -> S3PresignClient:
-    """Create boto3 S3 client lazily to keep test dependencies small."""
+    """Create boto3 S3 client lazily, once per container, to keep test dependencies small."""
     import boto3  # Imported lazily so tests can stub the client without boto3 installed.
 
     return boto3.client("s3")
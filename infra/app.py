@@ -36,6 +36,9 @@ calendar_token = app.node.try_get_context("calendarToken") or "demo-calendar-tok
 calendar_token_user_id = app.node.try_get_context("calendarTokenUserId") or "demo-user"
 calendar_fixture_fallback = app.node.try_get_context("calendarFixtureFallback") or "1"
 canvas_sync_schedule_hours = int(app.node.try_get_context("canvasSyncScheduleHours") or "24")
+precompile_lambda_bytecode_context = app.node.try_get_context("precompileLambdaBytecode") or "0"
+canvas_connection_index_context = app.node.try_get_context("canvasConnectionIndex") or "0"
+api_keep_warm_minutes = int(app.node.try_get_context("apiKeepWarmMinutes") or "5")
 project_root = Path(__file__).resolve().parents[1]
 frontend_asset_path = app.node.try_get_context("frontendAssetPath") or str(project_root / "out")
 frontend_allowed_origins_raw = os.getenv("FRONTEND_ALLOWED_ORIGINS", "http://localhost:3000")
@@ -52,6 +55,7 @@ data_stack = DataStack(
     "GurtDataStack",
     env=env,
     frontend_allowed_origins=frontend_allowed_origins,
+    canvas_connection_index=str(canvas_connection_index_context).strip().lower() in {"1", "true", "yes", "on"},
 )
 
 knowledge_base_stack = None
@@ -93,6 +97,8 @@ api_stack = ApiStack(
     calendar_token_user_id=calendar_token_user_id,
     calendar_fixture_fallback=calendar_fixture_fallback,
     canvas_sync_schedule_hours=canvas_sync_schedule_hours,
+    precompile_lambda_bytecode=str(precompile_lambda_bytecode_context).strip().lower() in {"1", "true", "yes", "on"},
+    api_keep_warm_minutes=api_keep_warm_minutes,
 )
 api_stack.add_dependency(data_stack)
 if knowledge_base_stack is not None:
@@ -5,7 +5,7 @@ from __future__ import annotations
 from pathlib import Path
 import re
 
-from aws_cdk import CfnOutput, Duration, Size, Stack
+from aws_cdk import BundlingOptions, CfnOutput, Duration, Size, Stack
 from aws_cdk import aws_apigateway as apigateway
 from aws_cdk import aws_bedrock as bedrock
 from aws_cdk import aws_ecr_assets as ecr_assets
@@ -49,6 +49,8 @@ class ApiStack(Stack):
         calendar_token_user_id: str,
         calendar_fixture_fallback: str,
         canvas_sync_schedule_hours: int,
+        precompile_lambda_bytecode: bool = False,
+        api_keep_warm_minutes: int = 0,
         **kwargs,
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
@@ -207,19 +209,41 @@ class ApiStack(Stack):
             configured_guardrail_version = published_guardrail.attr_version
 
         project_root = Path(__file__).resolve().parents[2]
+        lambda_code_exclude = [
+            ".git",
+            ".github",
+            ".next",
+            "infra",
+            "node_modules",
+            "cdk.out",
+            "__pycache__",
+            "tests",
+            "docs",
+        ]
+        lambda_code_bundling = None
+        if precompile_lambda_bytecode:
+            # Compile with the runtime's own interpreter so cold starts load .pyc instead of
+            # compiling every module. unchecked-hash pycs stay valid regardless of asset mtimes,
+            # since /var/task is read-only and stale timestamp pycs could never be rewritten.
+            copy_excludes = " ".join(f"--exclude='./{name}'" for name in lambda_code_exclude)
+            lambda_code_bundling = BundlingOptions(
+                image=lambda_.Runtime.PYTHON_3_12.bundling_image,
+                command=[
+                    "bash",
+                    "-c",
+                    f"tar -C /asset-input {copy_excludes} -cf - . | tar -C /asset-output -xf - && "
+                    # Wheels are pinned to the functions' x86_64 / CPython 3.12 target, so an arm64
+                    # Docker host still ships native extensions that import on Lambda.
+                    "pip install --no-cache-dir --only-binary=:all: --platform manylinux2014_x86_64 "
+                    "--implementation cp --python-version 3.12 "
+                    "-r /asset-input/backend/requirements.txt -t /asset-output && "
+                    "python -m compileall -q -j 0 --invalidation-mode unchecked-hash /asset-output",
+                ],
+            )
         lambda_code = lambda_.Code.from_asset(
             str(project_root),
-            exclude=[
-                ".git",
-                ".github",
-                ".next",
-                "infra",
-                "node_modules",
-                "cdk.out",
-                "__pycache__",
-                "tests",
-                "docs",
-            ],
+            exclude=lambda_code_exclude,
+            bundling=lambda_code_bundling,
         )
 
         env = {
@@ -232,6 +256,7 @@ class ApiStack(Stack):
             "BEDROCK_MODEL_ARN": bedrock_model_arn,
             "CALENDAR_TOKEN_MINTING_PATH": calendar_token_minting_path,
             "CANVAS_DATA_TABLE": data_stack.canvas_data_table.table_name,
+            "CANVAS_CONNECTION_INDEX": data_stack.canvas_connection_index_name,
             "CALENDAR_TOKENS_TABLE": data_stack.calendar_tokens_table.table_name,
             "DOCS_TABLE": data_stack.docs_table.table_name,
             "CARDS_TABLE": data_stack.cards_table.table_name,
@@ -695,6 +720,23 @@ class ApiStack(Stack):
         )
         sync_rule.add_target(targets.LambdaFunction(app_api_handler))
 
+        if api_keep_warm_minutes > 0:
+            # The handler answers this payload before routing, so pings only keep an environment warm.
+            keep_warm_rule = events.Rule(
+                self,
+                "AppApiKeepWarmRule",
+                schedule=events.Schedule.rate(Duration.minutes(api_keep_warm_minutes)),
+                description="Keep-warm ping for the API Lambda; skips routing and Canvas sync.",
+            )
+            keep_warm_rule.add_target(
+                targets.LambdaFunction(
+                    app_api_handler,
+                    event=events.RuleTargetInput.from_object(
+                        {"source": "aws.events", "detail-type": "Warmer Ping"}
+                    ),
+                )
+            )
+
         api_base_url = self.rest_api.url.rstrip("/")
         CfnOutput(
             self,
@@ -17,6 +17,7 @@ class DataStack(Stack):
         construct_id: str,
         *,
         frontend_allowed_origins: list[str] | None = None,
+        canvas_connection_index: bool = False,
         **kwargs,
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
@@ -59,6 +60,26 @@ class DataStack(Stack):
             sort_key=dynamodb.Attribute(name="sk", type=dynamodb.AttributeType.STRING),
             **table_kwargs,
         )
+        # User-wide due-date index; CanvasItem rows already carry gsi2pk=USER#{userId}
+        # and gsi2sk=DUE#{dueAt}#COURSE#{courseId}#ITEM#{itemId}.
+        self.canvas_data_table.add_global_secondary_index(
+            index_name="gsi2",
+            partition_key=dynamodb.Attribute(name="gsi2pk", type=dynamodb.AttributeType.STRING),
+            sort_key=dynamodb.Attribute(name="gsi2sk", type=dynamodb.AttributeType.STRING),
+        )
+        # Lets the scheduled sync list CanvasConnection rows without scanning the whole table. The index is
+        # sparse: only connection rows carry connectionIndexPk, so Canvas item/material writes never touch it.
+        # Opt-in via the canvasConnectionIndex context, because CloudFormation adds one GSI per table per
+        # stack update and gsi2 must be deployed first.
+        self.canvas_connection_index_name = ""
+        if canvas_connection_index:
+            self.canvas_connection_index_name = "connectionIndex"
+            self.canvas_data_table.add_global_secondary_index(
+                index_name=self.canvas_connection_index_name,
+                partition_key=dynamodb.Attribute(name="connectionIndexPk", type=dynamodb.AttributeType.STRING),
+                projection_type=dynamodb.ProjectionType.INCLUDE,
+                non_key_attributes=["entityType", "userId", "canvasBaseUrl", "accessToken"],
+            )
 
         self.calendar_tokens_table = dynamodb.Table(
             self,
@@ -80,6 +101,12 @@ class DataStack(Stack):
             partition_key=dynamodb.Attribute(name="cardId", type=dynamodb.AttributeType.STRING),
             **table_kwargs,
         )
+        # Per-course card reads for /study/today and /study/mastery; rows come back ordered by dueAt.
+        self.cards_table.add_global_secondary_index(
+            index_name="courseDueAtIndex",
+            partition_key=dynamodb.Attribute(name="courseId", type=dynamodb.AttributeType.STRING),
+            sort_key=dynamodb.Attribute(name="dueAt", type=dynamodb.AttributeType.STRING),
+        )
 
         CfnOutput(
             self,
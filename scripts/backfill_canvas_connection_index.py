@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Tag existing Canvas connection rows with the sparse connectionIndex key before enabling the index."""
+
+from __future__ import annotations
+
+import argparse
+from typing import Any, Iterator
+
+ENTITY_CANVAS_CONNECTION = "CanvasConnection"
+CONNECTION_INDEX_PK = "connectionIndexPk"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--table-name", required=True, help="CanvasDataTable name (CanvasDataTableName output)")
+    parser.add_argument("--dry-run", action="store_true", help="Count untagged connections without writing")
+    return parser.parse_args()
+
+
+def iter_untagged_connection_keys(table: Any) -> Iterator[dict[str, Any]]:
+    scan_kwargs = {
+        "FilterExpression": "#entityType = :entityType AND attribute_not_exists(#indexPk)",
+        "ProjectionExpression": "pk, sk",
+        "ExpressionAttributeNames": {"#entityType": "entityType", "#indexPk": CONNECTION_INDEX_PK},
+        "ExpressionAttributeValues": {":entityType": ENTITY_CANVAS_CONNECTION},
+    }
+    response = table.scan(**scan_kwargs)
+    while True:
+        for row in response.get("Items", ()):
+            yield {"pk": row["pk"], "sk": row["sk"]}
+        if "LastEvaluatedKey" not in response:
+            return
+        response = table.scan(ExclusiveStartKey=response["LastEvaluatedKey"], **scan_kwargs)
+
+
+def is_conditional_check_failure(exc: Exception) -> bool:
+    response = getattr(exc, "response", None)
+    error = response.get("Error") if isinstance(response, dict) else None
+    return isinstance(error, dict) and error.get("Code") == "ConditionalCheckFailedException"
+
+
+def tag_canvas_connections(table: Any, *, dry_run: bool = False) -> int:
+    """Add the index key to untagged connection rows; returns how many rows were (or would be) tagged."""
+    tagged = 0
+    for key in iter_untagged_connection_keys(table):
+        if dry_run:
+            tagged += 1
+            continue
+        try:
+            table.update_item(
+                Key=key,
+                UpdateExpression="SET #indexPk = :indexPk",
+                # update_item upserts; never recreate a connection deleted since the scan.
+                ConditionExpression="attribute_exists(pk)",
+                ExpressionAttributeNames={"#indexPk": CONNECTION_INDEX_PK},
+                ExpressionAttributeValues={":indexPk": ENTITY_CANVAS_CONNECTION},
+            )
+        except Exception as exc:
+            if not is_conditional_check_failure(exc):
+                raise
+            continue
+        tagged += 1
+    return tagged
+
+
+def main() -> int:
+    args = parse_args()
+    import boto3
+
+    table = boto3.resource("dynamodb").Table(args.table_name)
+    tagged = tag_canvas_connections(table, dry_run=args.dry_run)
+    verb = "Would tag" if args.dry_run else "Tagged"
+    print(f"{verb} {tagged} Canvas connection row(s) in {args.table_name}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -23,6 +23,10 @@ CREATE_KB_STACK="${CREATE_KB_STACK:-0}"
 CALENDAR_TOKEN_MINTING_PATH="${CALENDAR_TOKEN_MINTING_PATH:-endpoint}"
 CALENDAR_TOKEN="${CALENDAR_TOKEN:-demo-calendar-token}"
 CALENDAR_TOKEN_USER_ID="${CALENDAR_TOKEN_USER_ID:-demo-user}"
+# Ship .pyc compiled by the Lambda Python image (needs Docker, like the ingest image build).
+PRECOMPILE_LAMBDA_BYTECODE="${PRECOMPILE_LAMBDA_BYTECODE:-1}"
+# Adds the CanvasConnection GSI; enable only on a deploy after gsi2 exists (one new GSI per table update).
+CANVAS_CONNECTION_INDEX="${CANVAS_CONNECTION_INDEX:-0}"
 OUTPUTS_FILE="${OUTPUTS_FILE:-$ROOT_DIR/outputs.${STAGE_NAME}.json}"
 FRONTEND_ASSET_PATH="${FRONTEND_ASSET_PATH:-$ROOT_DIR/out}"
 FRONTEND_ALLOWED_ORIGINS="${FRONTEND_ALLOWED_ORIGINS:-https://d2ffy8wtp214n4.cloudfront.net,http://localhost:3000}"
@@ -97,6 +101,8 @@ npx --yes "$CDK_CLI_PACKAGE" bootstrap \
   --context "calendarTokenMintingPath=$CALENDAR_TOKEN_MINTING_PATH" \
   --context "calendarToken=$CALENDAR_TOKEN" \
   --context "calendarTokenUserId=$CALENDAR_TOKEN_USER_ID" \
+  --context "precompileLambdaBytecode=$PRECOMPILE_LAMBDA_BYTECODE" \
+  --context "canvasConnectionIndex=$CANVAS_CONNECTION_INDEX" \
   --context "frontendAssetPath=$FRONTEND_ASSET_PATH"
 
 STACK_LIST="$(npx --yes "$CDK_CLI_PACKAGE" ls \
@@ -113,6 +119,8 @@ STACK_LIST="$(npx --yes "$CDK_CLI_PACKAGE" ls \
   --context "calendarTokenMintingPath=$CALENDAR_TOKEN_MINTING_PATH" \
   --context "calendarToken=$CALENDAR_TOKEN" \
   --context "calendarTokenUserId=$CALENDAR_TOKEN_USER_ID" \
+  --context "precompileLambdaBytecode=$PRECOMPILE_LAMBDA_BYTECODE" \
+  --context "canvasConnectionIndex=$CANVAS_CONNECTION_INDEX" \
   --context "frontendAssetPath=$FRONTEND_ASSET_PATH")"
 echo "Synth stack list:"
 echo "$STACK_LIST"
@@ -147,6 +155,8 @@ npx --yes "$CDK_CLI_PACKAGE" deploy $API_DEPLOY_STACKS \
   --context "calendarTokenMintingPath=$CALENDAR_TOKEN_MINTING_PATH" \
   --context "calendarToken=$CALENDAR_TOKEN" \
   --context "calendarTokenUserId=$CALENDAR_TOKEN_USER_ID" \
+  --context "precompileLambdaBytecode=$PRECOMPILE_LAMBDA_BYTECODE" \
+  --context "canvasConnectionIndex=$CANVAS_CONNECTION_INDEX" \
   --context "frontendAssetPath=$FRONTEND_ASSET_PATH"
 
 echo "Phase B: rebuilding frontend with freshly deployed ApiBaseUrl."
@@ -175,6 +185,8 @@ npx --yes "$CDK_CLI_PACKAGE" deploy GurtFrontendStack \
   --context "calendarTokenMintingPath=$CALENDAR_TOKEN_MINTING_PATH" \
   --context "calendarToken=$CALENDAR_TOKEN" \
   --context "calendarTokenUserId=$CALENDAR_TOKEN_USER_ID" \
+  --context "precompileLambdaBytecode=$PRECOMPILE_LAMBDA_BYTECODE" \
+  --context "canvasConnectionIndex=$CANVAS_CONNECTION_INDEX" \
   --context "frontendAssetPath=$FRONTEND_ASSET_PATH"
 
 python3 - "$OUTPUTS_FILE" "$FRONTEND_OUTPUTS_FILE" <<'PY'
@@ -6,9 +6,10 @@ import re
 from dataclasses import dataclass
 from decimal import Decimal
 from datetime import datetime
-from typing import Any, Mapping
+from typing import Any, Iterable, Iterator, Mapping
 
 ITEM_TYPES = frozenset(("assignment", "exam", "quiz"))
+_CANVAS_ITEM_API_FIELDS = frozenset(("id", "courseId", "title", "itemType", "dueAt", "pointsPossible"))
 HEX_COLOR_PATTERN = re.compile(r"^#[0-9A-Fa-f]{6}$")
 
 ATTR_PK = "pk"
@@ -29,7 +30,7 @@ class ModelValidationError(ValueError):
     """Raised when model payloads or records fail validation."""
 
 
-def _validate_required_exact_keys(payload: Mapping[str, Any], required: set[str], label: str) -> None:
+def _validate_required_exact_keys(payload: Mapping[str, Any], required: set[str] | frozenset[str], label: str) -> None:
     """Validate exact contract keys for contract-facing payloads."""
     missing = sorted(required - set(payload.keys()))
     if missing:
@@ -77,10 +78,35 @@ def _to_dynamodb_number(value: float | int | Decimal) -> float | int | Decimal:
     return value
 
 
+def _format_course_partition_key(uid: str) -> str:
+    """Format a user partition key from an already-validated userId."""
+    return f"USER#{uid}"
+
+
+def _format_item_partition_key(uid: str, cid: str) -> str:
+    """Format an item partition key from already-validated ids."""
+    return f"{_format_course_partition_key(uid)}#COURSE#{cid}"
+
+
+def _format_item_sort_key(iid: str) -> str:
+    """Format an item sort key from an already-validated itemId."""
+    return f"ITEM#{iid}"
+
+
+def _format_item_due_sort_key(due: str, iid: str) -> str:
+    """Format a course due key from already-validated fields."""
+    return f"DUE#{due}#{_format_item_sort_key(iid)}"
+
+
+def _format_user_due_sort_key(due: str, cid: str, iid: str) -> str:
+    """Format a user-wide due key from already-validated fields."""
+    return f"DUE#{due}#COURSE#{cid}#{_format_item_sort_key(iid)}"
+
+
 def course_partition_key(user_id: str) -> str:
     """Shared partition key for all course rows for a user."""
     uid = _validate_non_empty_string(user_id, "userId")
-    return f"USER#{uid}"
+    return _format_course_partition_key(uid)
 
 
 def course_sort_key(course_id: str) -> str:
@@ -93,20 +119,20 @@ def item_partition_key(user_id: str, course_id: str) -> str:
     """Partition key for all canvas items under a user+course."""
     uid = _validate_non_empty_string(user_id, "userId")
     cid = _validate_non_empty_string(course_id, "courseId")
-    return f"USER#{uid}#COURSE#{cid}"
+    return _format_item_partition_key(uid, cid)
 
 
 def item_sort_key(item_id: str) -> str:
     """Stable sort key per item, independent from due date changes."""
     iid = _validate_non_empty_string(item_id, "itemId")
-    return f"ITEM#{iid}"
+    return _format_item_sort_key(iid)
 
 
 def item_due_sort_key(due_at: str, item_id: str) -> str:
     """Due-date-sortable key for course-level upcoming item queries."""
     due = _validate_date_time(due_at, "dueAt")
     iid = _validate_non_empty_string(item_id, "itemId")
-    return f"DUE#{due}#ITEM#{iid}"
+    return _format_item_due_sort_key(due, iid)
 
 
 def user_due_sort_key(due_at: str, course_id: str, item_id: str) -> str:
@@ -114,7 +140,7 @@ def user_due_sort_key(due_at: str, course_id: str, item_id: str) -> str:
     due = _validate_date_time(due_at, "dueAt")
     cid = _validate_non_empty_string(course_id, "courseId")
     iid = _validate_non_empty_string(item_id, "itemId")
-    return f"DUE#{due}#COURSE#{cid}#ITEM#{iid}"
+    return _format_user_due_sort_key(due, cid, iid)
 
 
 def material_sort_key(canvas_file_id: str) -> str:
@@ -271,6 +297,50 @@ class CanvasItem:
             ATTR_UPDATED_AT: stamp,
         }
 
+    @classmethod
+    def dynamodb_items_from_api(
+        cls,
+        payloads: Iterable[Mapping[str, Any]],
+        user_id: str,
+        updated_at: str,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield `from_api_dict(p).to_dynamodb_item(...)` rows without building intermediate models.
+
+        userId/updatedAt are validated once for the batch and each field once per payload,
+        raising the same ModelValidationError the model path would.
+        """
+        uid = _validate_non_empty_string(user_id, "userId")
+        stamp = _validate_date_time(updated_at, "updatedAt")
+        user_pk = _format_course_partition_key(uid)
+        for payload in payloads:
+            _validate_required_exact_keys(payload, _CANVAS_ITEM_API_FIELDS, "CanvasItem")
+            item_id = _validate_non_empty_string(payload["id"], "id")
+            course_id = _validate_non_empty_string(payload["courseId"], "courseId")
+            title = _validate_non_empty_string(payload["title"], "title")
+            item_type = _validate_non_empty_string(payload["itemType"], "itemType")
+            if item_type not in ITEM_TYPES:
+                raise ModelValidationError(f"itemType: unsupported value '{item_type}'")
+            due_at = _validate_date_time(payload["dueAt"], "dueAt")
+            points_possible = _validate_non_negative_number(payload["pointsPossible"], "pointsPossible")
+            item_pk = _format_item_partition_key(uid, course_id)
+            yield {
+                ATTR_PK: item_pk,
+                ATTR_SK: _format_item_sort_key(item_id),
+                ATTR_ENTITY_TYPE: ENTITY_ITEM,
+                "userId": uid,
+                "id": item_id,
+                "courseId": course_id,
+                "title": title,
+                "itemType": item_type,
+                "dueAt": due_at,
+                "pointsPossible": _to_dynamodb_number(points_possible),
+                ATTR_GSI1_PK: item_pk,
+                ATTR_GSI1_SK: _format_item_due_sort_key(due_at, item_id),
+                ATTR_GSI2_PK: user_pk,
+                ATTR_GSI2_SK: _format_user_due_sort_key(due_at, course_id, item_id),
+                ATTR_UPDATED_AT: stamp,
+            }
+
     @classmethod
     def from_dynamodb_item(
         cls,
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+from backfill_canvas_connection_index import tag_canvas_connections
+
+
+def _dynamodb_error(code: str) -> Exception:
+    error = Exception(code)
+    error.response = {"Error": {"Code": code}}
+    return error
+
+
+class BackfillCanvasConnectionIndexTests(unittest.TestCase):
+    def test_tags_untagged_connections_page_by_page_with_a_conditional_write(self) -> None:
+        table = MagicMock()
+        table.scan.side_effect = [
+            {"Items": [{"pk": "USER#u1", "sk": "CANVAS_CONNECTION#default"}], "LastEvaluatedKey": {"pk": "p"}},
+            {"Items": [{"pk": "USER#u2", "sk": "CANVAS_CONNECTION#default"}]},
+        ]
+
+        self.assertEqual(tag_canvas_connections(table), 2)
+
+        self.assertEqual(table.scan.call_args.kwargs["ExclusiveStartKey"], {"pk": "p"})
+        self.assertIn("attribute_not_exists(#indexPk)", table.scan.call_args.kwargs["FilterExpression"])
+        self.assertEqual(
+            [call.kwargs["Key"] for call in table.update_item.call_args_list],
+            [
+                {"pk": "USER#u1", "sk": "CANVAS_CONNECTION#default"},
+                {"pk": "USER#u2", "sk": "CANVAS_CONNECTION#default"},
+            ],
+        )
+        for call in table.update_item.call_args_list:
+            self.assertEqual(call.kwargs["ConditionExpression"], "attribute_exists(pk)")
+
+    def test_skips_connections_deleted_since_the_scan(self) -> None:
+        table = MagicMock()
+        table.scan.return_value = {"Items": [{"pk": "USER#u1", "sk": "CANVAS_CONNECTION#default"}]}
+        table.update_item.side_effect = _dynamodb_error("ConditionalCheckFailedException")
+
+        self.assertEqual(tag_canvas_connections(table), 0)
+
+    def test_other_write_errors_propagate(self) -> None:
+        table = MagicMock()
+        table.scan.return_value = {"Items": [{"pk": "USER#u1", "sk": "CANVAS_CONNECTION#default"}]}
+        table.update_item.side_effect = _dynamodb_error("ProvisionedThroughputExceededException")
+
+        with self.assertRaises(Exception):
+            tag_canvas_connections(table)
+
+    def test_dry_run_counts_without_writing(self) -> None:
+        table = MagicMock()
+        table.scan.return_value = {"Items": [{"pk": "USER#u1", "sk": "CANVAS_CONNECTION#default"}]}
+
+        self.assertEqual(tag_canvas_connections(table, dry_run=True), 1)
+        table.update_item.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,6 +17,7 @@ from backend.canvas_client import (
     fetch_course_files,
     fetch_file_bytes,
     normalize_canvas_base_url,
+    open_file_stream,
 )
 
 
@@ -136,6 +137,29 @@ class CanvasClientTests(unittest.TestCase):
 
         self.assertEqual(user_id, "4242")
 
+    def test_fetch_current_user_id_raises_for_malformed_json(self) -> None:
+        with patch("backend.canvas_client.urlopen", return_value=_FakeResponse(b"{not json")):
+            with self.assertRaises(CanvasApiError):
+                fetch_current_user_id(
+                    base_url="https://canvas.calpoly.edu/",
+                    token="token",
+                    user_agent="test-agent",
+                )
+
+    def test_fetch_current_user_id_parses_with_stdlib_json_fallback(self) -> None:
+        payload = {"id": 4242, "name": "Student"}
+        with (
+            patch("backend.canvas_client.orjson", None),
+            patch("backend.canvas_client.urlopen", return_value=_FakeResponse(payload)),
+        ):
+            user_id = fetch_current_user_id(
+                base_url="https://canvas.calpoly.edu/",
+                token="token",
+                user_agent="test-agent",
+            )
+
+        self.assertEqual(user_id, "4242")
+
     def test_fetch_course_files_filters_hidden_and_unpublished(self) -> None:
         payload = [
             {
@@ -197,5 +221,17 @@ class CanvasClientTests(unittest.TestCase):
         self.assertEqual(content_type, "application/pdf")
 
 
+    def test_open_file_stream_yields_unread_response_and_content_type(self) -> None:
+        response = _FakeResponse(b"pdf-data", content_type="Application/PDF")
+        with patch("backend.canvas_client.urlopen", return_value=response):
+            with open_file_stream(
+                url="https://canvas.calpoly.edu/files/2001/download",
+                token="token",
+                user_agent="test-agent",
+            ) as (stream, content_type):
+                self.assertIs(stream, response)
+                self.assertEqual(content_type, "application/pdf")
+                self.assertEqual(stream.read(), b"pdf-data")
+
 if __name__ == "__main__":
     unittest.main()
@@ -178,6 +178,67 @@ class CanvasItemModelTests(unittest.TestCase):
         )
         self.assertEqual(record["pointsPossible"], Decimal("12.5"))
 
+    def test_canvas_item_bulk_dynamodb_items_match_model_mapping(self) -> None:
+        payloads = [
+            {
+                "id": "item-exam-1",
+                "courseId": "course-psych-101",
+                "title": "Midterm Exam",
+                "itemType": "exam",
+                "dueAt": "2026-10-15T17:00:00Z",
+                "pointsPossible": 100,
+            },
+            {
+                "id": "item-assignment-2",
+                "courseId": "course-psych-101",
+                "title": "Essay Draft",
+                "itemType": "assignment",
+                "dueAt": "2026-10-20T17:00:00Z",
+                "pointsPossible": 12.5,
+            },
+        ]
+        records = list(
+            CanvasItem.dynamodb_items_from_api(payloads, user_id="demo-user", updated_at="2026-09-01T10:15:00Z")
+        )
+
+        expected = [
+            CanvasItem.from_api_dict(payload).to_dynamodb_item(
+                user_id="demo-user",
+                updated_at="2026-09-01T10:15:00Z",
+            )
+            for payload in payloads
+        ]
+        self.assertEqual(records, expected)
+        self.assertEqual([list(record) for record in records], [list(record) for record in expected])
+
+    def test_canvas_item_bulk_dynamodb_items_reject_invalid_payloads(self) -> None:
+        valid = {
+            "id": "item-exam-1",
+            "courseId": "course-psych-101",
+            "title": "Midterm Exam",
+            "itemType": "exam",
+            "dueAt": "2026-10-15T17:00:00Z",
+            "pointsPossible": 100,
+        }
+        invalid_payloads = [
+            {**valid, "extra": True},
+            {**valid, "itemType": "lab"},
+            {**valid, "dueAt": "2026-10-15"},
+            {**valid, "pointsPossible": -1},
+        ]
+        for payload in invalid_payloads:
+            with self.subTest(payload=payload):
+                with self.assertRaises(ModelValidationError):
+                    list(
+                        CanvasItem.dynamodb_items_from_api(
+                            [payload],
+                            user_id="demo-user",
+                            updated_at="2026-09-01T10:15:00Z",
+                        )
+                    )
+        with self.assertRaises(ModelValidationError):
+            list(CanvasItem.dynamodb_items_from_api([valid], user_id="", updated_at="2026-09-01T10:15:00Z"))
+
     def test_canvas_item_from_dynamodb_item_rejects_user_key_mismatch(self) -> None:
         model = CanvasItem(
             id="item-exam-1",
@@ -207,7 +207,7 @@ class GenerationCitationTests(unittest.TestCase):
             "ContentType": "text/plain",
         }
         with (
-            patch.dict("sys.modules", {"boto3": MagicMock(client=MagicMock(return_value=s3_client))}),
+            patch("backend.generation._s3_client", return_value=s3_client),
             patch(
                 "backend.generation._invoke_model_multimodal_json",
                 return_value={
@@ -428,6 +428,46 @@ class BedrockGuardrailInvocationTests(unittest.TestCase):
             with self.assertRaises(generation.GuardrailBlockedError):
                 generation._invoke_model_json("Return json.")
 
+    @patch.dict(
+        "os.environ",
+        {"BEDROCK_MODEL_ID": "us.anthropic.claude-sonnet-4-5-20250929-v1:0"},
+        clear=False,
+    )
+    def test_invoke_model_json_round_trips_bodies_with_and_without_orjson(self) -> None:
+        for orjson_module in (generation.orjson, None):
+            with self.subTest(orjson=orjson_module is not None):
+                client = MagicMock()
+                body = MagicMock()
+                body.read.return_value = json.dumps(
+                    {"content": [{"type": "text", "text": "{\"ok\": true}"}]}
+                ).encode("utf-8")
+                client.invoke_model.return_value = {"body": body}
+
+                with (
+                    patch("backend.generation.orjson", orjson_module),
+                    patch("backend.generation._bedrock_runtime", return_value=client),
+                ):
+                    payload = generation._invoke_model_json("Return json.")
+
+                self.assertEqual(payload, {"ok": True})
+                request_body = json.loads(client.invoke_model.call_args.kwargs["body"])
+                self.assertEqual(request_body["messages"][0]["role"], "user")
+
+    @patch.dict(
+        "os.environ",
+        {"BEDROCK_MODEL_ID": "us.anthropic.claude-sonnet-4-5-20250929-v1:0"},
+        clear=False,
+    )
+    def test_invoke_model_json_raises_for_unreadable_response_body(self) -> None:
+        client = MagicMock()
+        body = MagicMock()
+        body.read.return_value = b"not json"
+        client.invoke_model.return_value = {"body": body}
+
+        with patch("backend.generation._bedrock_runtime", return_value=client):
+            with self.assertRaises(generation.GenerationError):
+                generation._invoke_model_json("Return json.")
+
 
 class ModelJsonParsingTests(unittest.TestCase):
     def test_parse_model_json_text_handles_markdown_wrapped_array(self) -> None:
@@ -3,10 +3,17 @@
 from __future__ import annotations
 
 import os
+import sys
 import unittest
+from pathlib import Path
 from unittest import mock
 
-from backend.ingest_workflow import extract_handler, finalize_handler, start_textract_handler
+from backend.ingest_workflow import (
+    extract_handler,
+    finalize_handler,
+    poll_textract_handler,
+    start_textract_handler,
+)
 
 
 def _finish_event(
@@ -49,6 +56,35 @@ class FinalizeHandlerTests(unittest.TestCase):
     def _emitted_metric_names(self) -> list[str]:
         return [call.args[0] for call in self._emit_metric.call_args_list]
 
+    def test_finalize_uses_one_timestamp_for_status_kb_result_and_response(self) -> None:
+        mock_bedrock = mock.MagicMock()
+        mock_bedrock.start_ingestion_job.return_value = {
+            "ingestionJob": {"ingestionJobId": "kb-ingest-xyz"},
+        }
+        timestamps = iter(["2026-09-01T10:00:00Z", "2026-09-01T10:00:01Z", "2026-09-01T10:00:02Z"])
+
+        with self._patch_dynamodb():
+            with mock.patch.dict(
+                os.environ,
+                {
+                    "DOCS_TABLE": "test-docs",
+                    "KNOWLEDGE_BASE_ID": "kb-123",
+                    "KNOWLEDGE_BASE_DATA_SOURCE_ID": "ds-456",
+                },
+                clear=True,
+            ):
+                with (
+                    mock.patch("backend.ingest_workflow._bedrock_agent_client", return_value=mock_bedrock),
+                    mock.patch("backend.ingest_workflow._utc_now_rfc3339", side_effect=lambda: next(timestamps)),
+                ):
+                    result = finalize_handler(_finish_event(), None)
+
+        status_item = self._table.put_item.call_args.kwargs["Item"]
+        kb_values = self._table.update_item.call_args.kwargs["ExpressionAttributeValues"]
+        self.assertEqual(status_item["updatedAt"], "2026-09-01T10:00:00Z")
+        self.assertEqual(kb_values[":now"], "2026-09-01T10:00:00Z")
+        self.assertEqual(result["updatedAt"], "2026-09-01T10:00:00Z")
+
     def test_successful_finalize_triggers_kb_ingestion(self) -> None:
         """When status is FINISHED and KB ids are set, StartIngestionJob is called."""
         mock_bedrock = mock.MagicMock()
@@ -80,6 +116,7 @@ class FinalizeHandlerTests(unittest.TestCase):
         self.assertEqual(call_kw["knowledgeBaseId"], "kb-123")
         self.assertEqual(call_kw["dataSourceId"], "ds-456")
         self.assertIn("clientToken", call_kw)
+        self.assertGreaterEqual(len(call_kw["clientToken"]), 33)
         self._table.update_item.assert_called()
         values = self._table.update_item.call_args.kwargs.get("ExpressionAttributeValues", {})
         self.assertEqual(values.get(":jid"), "kb-ingest-xyz")
@@ -414,6 +451,42 @@ class FinalizeHandlerTests(unittest.TestCase):
 
 
 class ExtractAndTextractRoutingTests(unittest.TestCase):
+    def test_extract_handler_reads_native_pdf_from_disk_without_buffering(self) -> None:
+        event = {
+            "bucket": "uploads-bucket",
+            "key": "uploads/course-1/doc-1/syllabus.pdf",
+            "threshold": 5,
+        }
+        opened_paths: list[str] = []
+
+        def fake_download(bucket: str, key: str, path: Path) -> None:
+            self.assertEqual((bucket, key), ("uploads-bucket", "uploads/course-1/doc-1/syllabus.pdf"))
+            path.write_bytes(b"%PDF-1.7")
+
+        def fake_open(path: str, filetype: str) -> mock.MagicMock:
+            opened_paths.append(path)
+            page = mock.MagicMock()
+            page.get_text.return_value = "Syllabus text"
+            document = mock.MagicMock()
+            document.__enter__.return_value = [page]
+            return document
+
+        fake_fitz = mock.MagicMock()
+        fake_fitz.open.side_effect = fake_open
+        with (
+            mock.patch.dict(sys.modules, {"fitz": fake_fitz}),
+            mock.patch("backend.ingest_workflow._download_s3_to_path", side_effect=fake_download),
+            mock.patch("backend.ingest_workflow._read_s3_bytes") as read_bytes,
+        ):
+            result = extract_handler(event, None)
+
+        read_bytes.assert_not_called()
+        self.assertEqual(len(opened_paths), 1)
+        self.assertTrue(opened_paths[0].endswith("source.pdf"))
+        self.assertEqual(result["text"], "Syllabus text")
+        self.assertFalse(result["needsTextract"])
+        self.assertEqual(result["textractKey"], "uploads/course-1/doc-1/syllabus.pdf")
+
     def test_extract_handler_converts_pptx_and_sets_textract_key(self) -> None:
         event = {
             "bucket": "uploads-bucket",
@@ -563,3 +636,68 @@ class ExtractAndTextractRoutingTests(unittest.TestCase):
             "uploads/course-1/doc-1/week-1-slides.converted.pdf",
         )
         self.assertEqual(result["textractJobId"], "textract-job-1")
+
+    def test_poll_textract_follows_next_token_pages(self) -> None:
+        fake_client = mock.MagicMock()
+        fake_client.get_document_text_detection.side_effect = [
+            {
+                "JobStatus": "SUCCEEDED",
+                "NextToken": "page-2",
+                "Blocks": [
+                    {"BlockType": "PAGE"},
+                    {"BlockType": "LINE", "Text": "first line"},
+                ],
+            },
+            {
+                "JobStatus": "SUCCEEDED",
+                "Blocks": [
+                    {"BlockType": "WORD", "Text": "ignored"},
+                    {"BlockType": "LINE", "Text": "second line"},
+                ],
+            },
+        ]
+        with mock.patch("backend.ingest_workflow._textract_client", return_value=fake_client):
+            result = poll_textract_handler({"textractJobId": "textract-job-1"}, None)
+
+        self.assertEqual(result["text"], "first line\nsecond line")
+        self.assertTrue(result["done"])
+        self.assertEqual(
+            fake_client.get_document_text_detection.call_args_list[1].kwargs,
+            {"JobId": "textract-job-1", "NextToken": "page-2"},
+        )
+
+    def test_poll_textract_returns_early_while_in_progress(self) -> None:
+        fake_client = mock.MagicMock()
+        fake_client.get_document_text_detection.return_value = {"JobStatus": "IN_PROGRESS"}
+        with mock.patch("backend.ingest_workflow._textract_client", return_value=fake_client):
+            result = poll_textract_handler({"textractJobId": "textract-job-1"}, None)
+
+        self.assertFalse(result["done"])
+        self.assertEqual(fake_client.get_document_text_detection.call_count, 1)
+
+
+class AwsClientCachingTests(unittest.TestCase):
+    def test_clients_and_tables_are_reused_across_invocations(self) -> None:
+        from backend import ingest_workflow
+
+        for factory in (
+            ingest_workflow._s3_client,
+            ingest_workflow._dynamodb_resource,
+            ingest_workflow._dynamodb_table_named,
+        ):
+            factory.cache_clear()
+            self.addCleanup(factory.cache_clear)
+        boto3_stub = mock.MagicMock()
+        with (
+            mock.patch.dict("sys.modules", {"boto3": boto3_stub}),
+            mock.patch.dict(os.environ, {"DOCS_TABLE": "docs"}, clear=True),
+        ):
+            first_table = ingest_workflow._dynamodb_table()
+            second_table = ingest_workflow._dynamodb_table()
+            first_s3 = ingest_workflow._s3_client()
+            second_s3 = ingest_workflow._s3_client()
+
+        self.assertIs(first_table, second_table)
+        self.assertIs(first_s3, second_s3)
+        boto3_stub.resource.assert_called_once_with("dynamodb")
+        boto3_stub.client.assert_called_once_with("s3")
@@ -2,17 +2,23 @@
 
 from __future__ import annotations
 
+import io
 import json
+import threading
 import unittest
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
 from backend import generation
-from backend.canvas_client import CanvasApiError
+from backend.canvas_client import CanvasAccessDeniedError, CanvasApiError
 from gurt.calendar_tokens.model import CalendarTokenRecord
 from backend.runtime import lambda_handler
 
 
+_CONNECTION_INDEX_ENV = {"CANVAS_DATA_TABLE": "canvas-data", "CANVAS_CONNECTION_INDEX": "connectionIndex"}
+
+
 class _MemoryCalendarTokenStore:
     def __init__(self) -> None:
         self.rows: dict[str, CalendarTokenRecord] = {}
@@ -39,6 +45,8 @@ class _MemoryDocsTable:
 class _MemoryCardsTable:
     def __init__(self) -> None:
         self.rows: dict[str, dict] = {}
+        self.batch_writer_calls = 0
+        self.index_ready = True
 
     def put_item(self, Item: dict) -> None:  # noqa: N803 - boto3 shape
         self.rows[str(Item["cardId"])] = dict(Item)
@@ -47,11 +55,59 @@ class _MemoryCardsTable:
         row = self.rows.get(str(Key["cardId"]))
         return {"Item": dict(row)} if row is not None else {}
 
+    def update_item(
+        self,
+        Key: dict,  # noqa: N803 - boto3 shape
+        UpdateExpression: str,  # noqa: N803 - boto3 shape
+        ConditionExpression: str,  # noqa: N803 - boto3 shape
+        ExpressionAttributeValues: dict,  # noqa: N803 - boto3 shape
+    ) -> None:
+        # Understands the "a = :v" / attribute_not_exists(a) conditions and SET/ADD clauses the runtime sends.
+        row = self.rows.get(str(Key["cardId"]), {})
+        for clause in ConditionExpression.split(" AND "):
+            if clause.startswith("attribute_not_exists("):
+                holds = clause[len("attribute_not_exists(") : -1] not in row
+            else:
+                name, placeholder = clause.split(" = ")
+                holds = row.get(name) == ExpressionAttributeValues[placeholder]
+            if not holds:
+                error = Exception("conditional check failed")
+                error.response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+                raise error
+        set_clause, add_clause = UpdateExpression[len("SET ") :].split(" ADD ")
+        updated = dict(row, **Key)
+        for assignment in set_clause.split(", "):
+            name, placeholder = assignment.split(" = ")
+            updated[name] = ExpressionAttributeValues[placeholder]
+        name, placeholder = add_clause.split(" ")
+        updated[name] = updated.get(name, 0) + ExpressionAttributeValues[placeholder]
+        self.rows[str(Key["cardId"])] = updated
+
+    def query(self, **kwargs: dict) -> dict:  # noqa: ARG002 - boto3 compatibility
+        # Stands in for courseDueAtIndex: rows come back unordered and the runtime drops other courses.
+        if not self.index_ready:
+            raise _index_unavailable_error()
+        return {"Items": [dict(value) for value in self.rows.values()]}
+
     def scan(self, **kwargs: dict) -> dict:  # noqa: ARG002 - boto3 compatibility
         return {"Items": [dict(value) for value in self.rows.values()]}
 
+    @contextmanager
+    def batch_writer(self, **kwargs: dict):  # noqa: ARG002 - boto3 compatibility
+        self.batch_writer_calls += 1
+        yield self
+
+
+def _index_unavailable_error() -> Exception:
+    error = Exception("The table does not have the specified index")
+    error.response = {"Error": {"Code": "ValidationException"}}
+    return error
+
 
 class _FailingCardsTable:
+    def query(self, **kwargs: dict) -> dict:  # noqa: ARG002 - boto3 compatibility
+        raise _index_unavailable_error()
+
     def scan(self, **kwargs: dict) -> dict:  # noqa: ARG002 - boto3 compatibility
         raise Exception("simulated cards scan failure")
 
@@ -70,6 +126,116 @@ class RuntimeHandlerTests(unittest.TestCase):
         self.assertEqual(response["statusCode"], 200)
         self.assertEqual(json.loads(response["body"]), {"status": "ok"})
 
+    def test_json_bodies_round_trip_without_orjson(self) -> None:
+        with patch("backend.runtime.orjson", None):
+            health = self._invoke({"httpMethod": "GET", "path": "/health"}, env={"DEMO_MODE": "false"})
+            invalid = self._invoke({"httpMethod": "POST", "path": "/study/review", "body": "{not-json"})
+
+        self.assertEqual(json.loads(health["body"]), {"status": "ok"})
+        self.assertEqual(invalid["statusCode"], 400)
+        self.assertEqual(json.loads(invalid["body"])["error"], "request body must be valid JSON")
+
+    def test_fixtures_load_from_bytes_with_and_without_orjson(self) -> None:
+        from backend import runtime
+
+        filenames = ("courses.json", "canvas_items.json", "cards.json", "topics.json")
+        with_orjson = [runtime._read_json_fixture(name) for name in filenames]
+        with patch("backend.runtime.orjson", None):
+            without_orjson = [runtime._read_json_fixture(name) for name in filenames]
+
+        self.assertEqual(with_orjson, without_orjson)
+        self.assertEqual(
+            with_orjson,
+            [
+                runtime._fixture_courses(),
+                runtime._fixture_items(),
+                runtime._fixture_cards(),
+                runtime._fixture_topics(),
+            ],
+        )
+
+    def test_fixture_page_prefetch_hints_each_fixture_file(self) -> None:
+        import os
+
+        from backend import runtime
+
+        if not hasattr(os, "posix_fadvise"):
+            self.skipTest("posix_fadvise is not available on this platform")
+        with patch("os.posix_fadvise") as fadvise:
+            runtime._prefetch_fixture_pages()
+
+        self.assertEqual(fadvise.call_count, 4)
+        for call in fadvise.call_args_list:
+            self.assertEqual(call.args[1:], (0, 0, os.POSIX_FADV_WILLNEED))
+
+    def test_fixture_loaders_only_read_the_file_a_route_needs(self) -> None:
+        from backend import runtime
+
+        loaders = (
+            runtime._fixture_courses,
+            runtime._fixture_items,
+            runtime._fixture_cards,
+            runtime._fixture_topics,
+            runtime._fixture_courses_body,
+        )
+        for loader in loaders:
+            loader.cache_clear()
+        try:
+            with (
+                patch("backend.runtime._read_json_fixture", wraps=runtime._read_json_fixture) as read_fixture,
+                patch("backend.runtime._query_canvas_courses_for_user", return_value=[]),
+            ):
+                first = self._invoke({"httpMethod": "GET", "path": "/courses"})
+                second = self._invoke({"httpMethod": "GET", "path": "/courses"})
+        finally:
+            for loader in loaders:
+                loader.cache_clear()
+
+        self.assertEqual(first["statusCode"], 200)
+        self.assertEqual(first["body"], second["body"])
+        read_fixture.assert_called_once_with("courses.json")
+
+    def test_base64_encoded_json_body_is_parsed_from_bytes(self) -> None:
+        import base64
+
+        from backend import runtime
+
+        encoded = base64.b64encode(json.dumps({"cardId": "card-1", "rating": 3}).encode("utf-8")).decode("ascii")
+        for orjson_module in (runtime.orjson, None):
+            with self.subTest(orjson=orjson_module is not None), patch("backend.runtime.orjson", orjson_module):
+                self.assertEqual(
+                    runtime._parse_json_body({"body": encoded, "isBase64Encoded": True}),
+                    ({"cardId": "card-1", "rating": 3}, None),
+                )
+                for bad_body in ("not base64!", base64.b64encode(b"\xff{").decode("ascii")):
+                    self.assertEqual(
+                        runtime._parse_json_body({"body": bad_body, "isBase64Encoded": True}),
+                        (None, "request body must be valid JSON"),
+                    )
+
+    def test_review_payload_errors_are_reported_in_field_order(self) -> None:
+        from backend.runtime import _validate_review_payload
+
+        valid = {"cardId": "card-1", "courseId": "course-1", "rating": 3, "reviewedAt": "2026-09-01T10:00:00Z"}
+        cases = [
+            ({}, "cardId is required"),
+            ({**valid, "courseId": "  "}, "courseId is required"),
+            ({**valid, "rating": 9, "reviewedAt": ""}, "reviewedAt is required"),
+            ({**valid, "rating": "3"}, "rating must be an integer between 1 and 5"),
+            ({**valid, "rating": 0}, "rating must be an integer between 1 and 5"),
+            ({**valid, "reviewedAt": "yesterday"}, "reviewedAt must be an RFC3339 timestamp"),
+            (valid, None),
+        ]
+        for payload, expected in cases:
+            with self.subTest(payload=payload):
+                self.assertEqual(_validate_review_payload(payload), expected)
+
+    def test_invalid_json_body_is_rejected(self) -> None:
+        response = self._invoke({"httpMethod": "POST", "path": "/study/review", "body": "{not-json"})
+
+        self.assertEqual(response["statusCode"], 400)
+        self.assertEqual(json.loads(response["body"])["error"], "request body must be valid JSON")
+
     def test_health_route_includes_cors_headers(self) -> None:
         response = self._invoke({"httpMethod": "GET", "path": "/health"}, env={"DEMO_MODE": "false"})
         self.assertEqual(response["statusCode"], 200)
@@ -78,6 +244,18 @@ class RuntimeHandlerTests(unittest.TestCase):
         self.assertIn("POST", headers.get("Access-Control-Allow-Methods", ""))
         self.assertIn("Content-Type", headers.get("Access-Control-Allow-Headers", ""))
 
+    def test_cors_headers_follow_env_between_invocations(self) -> None:
+        first = self._invoke(
+            {"httpMethod": "GET", "path": "/health"},
+            env={"DEMO_MODE": "false", "CORS_ALLOW_ORIGIN": "https://app.example.com"},
+        )
+        first["headers"]["X-Mutated"] = "yes"
+        second = self._invoke({"httpMethod": "GET", "path": "/health"}, env={"DEMO_MODE": "false"})
+
+        self.assertEqual(first["headers"]["Access-Control-Allow-Origin"], "https://app.example.com")
+        self.assertEqual(second["headers"]["Access-Control-Allow-Origin"], "*")
+        self.assertNotIn("X-Mutated", second["headers"])
+
     def test_health_route_accepts_stage_prefixed_path(self) -> None:
         response = self._invoke(
             {
@@ -91,6 +269,46 @@ class RuntimeHandlerTests(unittest.TestCase):
         self.assertEqual(response["statusCode"], 200)
         self.assertEqual(json.loads(response["body"]), {"status": "ok"})
 
+    def test_unknown_route_returns_not_found_in_demo_mode(self) -> None:
+        response = self._invoke({"httpMethod": "GET", "path": "/does-not-exist"})
+
+        self.assertEqual(response["statusCode"], 404)
+        self.assertEqual(json.loads(response["body"]), {"error": "not found"})
+
+    def test_unknown_route_requires_demo_mode_when_disabled(self) -> None:
+        response = self._invoke({"httpMethod": "GET", "path": "/does-not-exist"}, env={"DEMO_MODE": "false"})
+
+        self.assertEqual(response["statusCode"], 503)
+
+    def test_route_method_mismatch_is_not_dispatched(self) -> None:
+        response = self._invoke({"httpMethod": "POST", "path": "/courses"})
+
+        self.assertEqual(response["statusCode"], 404)
+
+    def test_http_api_v2_event_shape_is_routed(self) -> None:
+        response = self._invoke(
+            {
+                "rawPath": "/dev/health",
+                "requestContext": {"http": {"method": "get"}, "stage": "dev"},
+            },
+            env={"DEMO_MODE": "false"},
+        )
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(json.loads(response["body"]), {"status": "ok"})
+
+    def test_malformed_request_context_falls_back_to_rest_event_fields(self) -> None:
+        response = self._invoke(
+            {
+                "httpMethod": "GET",
+                "path": "/health",
+                "requestContext": {"http": "not-a-dict", "stage": None},
+            },
+            env={"DEMO_MODE": "false"},
+        )
+
+        self.assertEqual(response["statusCode"], 200)
+
     def test_courses_route_uses_fixture_data(self) -> None:
         response = self._invoke({"httpMethod": "GET", "path": "/courses"})
 
@@ -147,6 +365,18 @@ class RuntimeHandlerTests(unittest.TestCase):
         self.assertEqual(len(rows), 2)
         self.assertTrue(all(row["courseId"] == "course-psych-101" for row in rows))
 
+    def test_course_items_returns_empty_list_for_unknown_fixture_course(self) -> None:
+        response = self._invoke(
+            {
+                "httpMethod": "GET",
+                "path": "/courses/course-unknown/items",
+                "pathParameters": {"courseId": "course-unknown"},
+            }
+        )
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(json.loads(response["body"]), [])
+
     def test_course_items_returns_runtime_rows_when_available(self) -> None:
         event = {
             "httpMethod": "GET",
@@ -277,7 +507,7 @@ class RuntimeHandlerTests(unittest.TestCase):
             }
         )
 
-        with patch("backend.runtime._cards_table", return_value=cards_table):
+        with self._patch_cards_table(cards_table):
             response = self._invoke(
                 {
                     "httpMethod": "GET",
@@ -309,7 +539,7 @@ class RuntimeHandlerTests(unittest.TestCase):
         self.assertEqual(len(rows), 5)
         self.assertEqual(rows[0]["courseId"], "course-psych-101")
     def test_study_today_falls_back_to_fixtures_when_runtime_cards_scan_fails(self) -> None:
-        with patch("backend.runtime._cards_table", return_value=_FailingCardsTable()):
+        with self._patch_cards_table(_FailingCardsTable()):
             response = self._invoke(
                 {
                     "httpMethod": "GET",
@@ -394,7 +624,7 @@ class RuntimeHandlerTests(unittest.TestCase):
             "requestContext": {"authorizer": {"principalId": "demo-user"}},
         }
         with (
-            patch("backend.runtime._cards_table", return_value=cards_table),
+            self._patch_cards_table(cards_table),
             patch(
                 "backend.runtime._query_canvas_course_items_for_user",
                 return_value=[
@@ -454,7 +684,7 @@ class RuntimeHandlerTests(unittest.TestCase):
             "requestContext": {"authorizer": {"principalId": "demo-user"}},
         }
         with (
-            patch("backend.runtime._cards_table", return_value=cards_table),
+            self._patch_cards_table(cards_table),
             patch(
                 "backend.runtime._query_canvas_course_items_for_user",
                 return_value=[
@@ -497,7 +727,7 @@ class RuntimeHandlerTests(unittest.TestCase):
             "requestContext": {"authorizer": {"principalId": "demo-user"}},
         }
         with (
-            patch("backend.runtime._cards_table", return_value=cards_table),
+            self._patch_cards_table(cards_table),
             patch(
                 "backend.runtime._query_canvas_course_items_for_user",
                 side_effect=Exception("simulated canvas read failure"),
@@ -548,7 +778,7 @@ class RuntimeHandlerTests(unittest.TestCase):
             "requestContext": {"authorizer": {"principalId": "demo-user"}},
         }
         with (
-            patch("backend.runtime._cards_table", return_value=cards_table),
+            self._patch_cards_table(cards_table),
             patch(
                 "backend.runtime._query_canvas_course_items_for_user",
                 return_value=[
@@ -601,7 +831,7 @@ class RuntimeHandlerTests(unittest.TestCase):
             "path": "/study/today",
             "queryStringParameters": {"courseId": "course-psych-101"},
         }
-        with patch("backend.runtime._cards_table", return_value=cards_table):
+        with self._patch_cards_table(cards_table):
             first_response = self._invoke(event, env={"DEMO_MODE": "false"})
             second_response = self._invoke(event, env={"DEMO_MODE": "false"})
 
@@ -634,7 +864,7 @@ class RuntimeHandlerTests(unittest.TestCase):
             "reviewedAt": "2026-09-01T10:15:00Z",
         }
 
-        with patch("backend.runtime._cards_table", return_value=cards_table):
+        with self._patch_cards_table(cards_table):
             response = self._invoke(
                 {
                     "httpMethod": "POST",
@@ -651,6 +881,93 @@ class RuntimeHandlerTests(unittest.TestCase):
         self.assertEqual(fsrs_state["lastReviewedAt"], "2026-09-01T10:15:00Z")
         self.assertEqual(updated_row["reviewCount"], 1)
 
+    def test_study_review_reapplies_on_top_of_a_concurrent_review(self) -> None:
+        from backend import runtime
+
+        cards_table = _MemoryCardsTable()
+        cards_table.put_item(
+            Item={
+                "cardId": "card-1",
+                "entityType": "Card",
+                "courseId": "course-1",
+                "topicId": "topic-1",
+                "prompt": "Prompt",
+                "answer": "Answer",
+                "dueAt": "2026-09-01T09:00:00Z",
+            }
+        )
+        original_get_item = cards_table.get_item
+        reads = 0
+
+        def get_item_racing_another_review(Key: dict) -> dict:  # noqa: N803 - boto3 shape
+            nonlocal reads
+            reads += 1
+            response = original_get_item(Key=Key)
+            if reads == 1:
+                # Another review commits between this read and the conditional write.
+                cards_table.rows["card-1"]["reviewCount"] = 1
+            return response
+
+        cards_table.get_item = get_item_racing_another_review
+        with self._patch_cards_table(cards_table):
+            runtime._update_card_review_state(
+                payload={"cardId": "card-1", "courseId": "course-1", "rating": 3},
+                reviewed_at="2026-09-01T10:00:00Z",
+            )
+
+        self.assertEqual(reads, 2)
+        self.assertEqual(cards_table.rows["card-1"]["reviewCount"], 2)
+        self.assertEqual(cards_table.rows["card-1"]["lastReviewedAt"], "2026-09-01T10:00:00Z")
+
+    def test_study_review_conflicts_once_every_conditional_write_loses_the_race(self) -> None:
+        cards_table = _MemoryCardsTable()
+        cards_table.put_item(Item={"cardId": "card-1", "courseId": "course-1", "dueAt": "2026-09-01T09:00:00Z"})
+        original_get_item = cards_table.get_item
+
+        def get_item_always_racing(Key: dict) -> dict:  # noqa: N803 - boto3 shape
+            response = original_get_item(Key=Key)
+            # A concurrent review commits between every read and its conditional write.
+            row = cards_table.rows["card-1"]
+            row["reviewCount"] = int(row.get("reviewCount", 0)) + 1
+            return response
+
+        cards_table.get_item = get_item_always_racing
+        event = {
+            "httpMethod": "POST",
+            "path": "/study/review",
+            "body": json.dumps(
+                {"cardId": "card-1", "courseId": "course-1", "rating": 3, "reviewedAt": "2026-09-01T10:00:00Z"}
+            ),
+        }
+        with (
+            self._patch_cards_table(cards_table),
+            patch.object(cards_table, "update_item", wraps=cards_table.update_item) as update_item,
+        ):
+            response = self._invoke(event, env={"DEMO_MODE": "false"})
+
+        self.assertEqual(update_item.call_count, 3)
+        self.assertEqual(response["statusCode"], 409)
+        body = json.loads(response["body"])
+        self.assertEqual(body["accepted"], False)
+        self.assertIn("reviewed concurrently", body["error"])
+        self.assertNotIn("lastReviewedAt", cards_table.rows["card-1"])
+
+    def test_study_review_ignores_cards_from_another_course(self) -> None:
+        from backend import runtime
+
+        cards_table = _MemoryCardsTable()
+        cards_table.put_item(Item={"cardId": "card-1", "courseId": "course-1", "dueAt": "2026-09-01T09:00:00Z"})
+        with (
+            self._patch_cards_table(cards_table),
+            patch.object(cards_table, "update_item") as update_item,
+        ):
+            runtime._update_card_review_state(
+                payload={"cardId": "card-1", "courseId": "course-2", "rating": 3},
+                reviewed_at="2026-09-01T10:00:00Z",
+            )
+
+        update_item.assert_not_called()
+
     def test_study_mastery_uses_runtime_cards_when_present(self) -> None:
         cards_table = _MemoryCardsTable()
         cards_table.put_item(
@@ -673,7 +990,7 @@ class RuntimeHandlerTests(unittest.TestCase):
             }
         )
 
-        with patch("backend.runtime._cards_table", return_value=cards_table):
+        with self._patch_cards_table(cards_table):
             response = self._invoke(
                 {
                     "httpMethod": "GET",
@@ -726,6 +1043,128 @@ class RuntimeHandlerTests(unittest.TestCase):
             self.fail("Expected token to be stored")
         self.assertEqual(record.user_id, "canvas-user-12345")
 
+    def test_request_maps_drop_null_values_and_lowercase_header_names(self) -> None:
+        from backend.runtime import _headers, _path_params, _query_params
+
+        event = {
+            "queryStringParameters": {"courseId": "c1", "examId": None},
+            "pathParameters": {"token": "abc", "courseId": None},
+            "headers": {"X-Gurt-Demo-User-Id": "user-1", "X-Empty": None},
+        }
+
+        self.assertEqual(_query_params(event), {"courseId": "c1"})
+        self.assertEqual(_path_params(event), {"token": "abc"})
+        self.assertEqual(_headers(event), {"x-gurt-demo-user-id": "user-1"})
+        self.assertEqual(_query_params({"queryStringParameters": None}), {})
+
+    def test_demo_user_id_header_is_read_case_insensitively(self) -> None:
+        from backend.runtime import _demo_user_id_from_headers
+
+        cases = [
+            ({"X-Gurt-Demo-User-Id": " user-1 "}, "user-1"),
+            ({"x-gurt-demo-user-id": "", "X-Demo-User-Id": "legacy-user"}, "legacy-user"),
+            ({"X-Gurt-Demo-User-Id": "bad user!"}, None),
+            ({"X-Gurt-Demo-User-Id": None}, None),
+            (None, None),
+        ]
+        for headers, expected in cases:
+            with self.subTest(headers=headers):
+                self.assertEqual(_demo_user_id_from_headers({"headers": headers}), expected)
+
+    def test_lowercase_http_api_method_resolves_static_route(self) -> None:
+        from backend.runtime import _request_method
+
+        response = self._invoke(
+            {"rawPath": "/health", "requestContext": {"http": {"method": "get"}}},
+            env={"DEMO_MODE": "false"},
+        )
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertIs(_request_method({"httpMethod": "post"}), _request_method({"httpMethod": "POST"}))
+        self.assertEqual(_request_method({"httpMethod": "purge"}), "PURGE")
+
+    def test_normalized_path_strips_only_a_whole_stage_segment(self) -> None:
+        from backend.runtime import _normalized_path
+
+        cases = [
+            ("dev", "/dev", "/"),
+            ("dev", "/dev/courses", "/courses"),
+            ("dev", "/devices", "/devices"),
+            ("dev", "/courses", "/courses"),
+            ("", "/dev/courses", "/dev/courses"),
+        ]
+        for stage, path, expected in cases:
+            with self.subTest(stage=stage, path=path):
+                self.assertEqual(_normalized_path({"requestContext": {"stage": stage}}, path), expected)
+
+    def test_path_extractors_match_only_a_single_non_empty_segment(self) -> None:
+        from backend.runtime import _extract_calendar_token, _extract_course_id_from_path
+
+        course_cases = [
+            ("/courses/course-1/items", "course-1"),
+            ("/courses/items", None),
+            ("/courses//items", None),
+            ("/courses/a/b/items", None),
+            ("/courses/course-1/items/", None),
+            ("/courses/course-1/materials", None),
+        ]
+        for path, expected in course_cases:
+            with self.subTest(path=path):
+                self.assertEqual(_extract_course_id_from_path(path, {}), expected)
+
+        calendar_cases = [
+            ("/calendar/tok.ics", "tok"),
+            ("/calendar/tok.ics.ics", "tok.ics"),
+            ("/calendar/.ics", None),
+            ("/calendar/a/b.ics", None),
+            ("/calendar/tok", None),
+        ]
+        for path, expected in calendar_cases:
+            with self.subTest(path=path):
+                self.assertEqual(_extract_calendar_token(path, {}), expected)
+
+    def test_authenticated_user_id_is_read_from_each_authorizer_shape(self) -> None:
+        from backend.runtime import _extract_authenticated_user_id
+
+        cases = [
+            ({"authorizer": {"principalId": " principal "}}, "principal"),
+            ({"authorizer": {"principalId": "  ", "claims": {"sub": "rest-sub"}}}, "rest-sub"),
+            ({"authorizer": {"jwt": {"claims": {"sub": "jwt-sub"}}}}, "jwt-sub"),
+            ({"authorizer": {"principalId": 42, "claims": "bad"}, "identity": {"userArn": "arn:user"}}, "arn:user"),
+            ({"authorizer": ["unexpected"], "identity": {"userArn": " "}}, None),
+            ({"identity": None}, None),
+            ({}, None),
+        ]
+        for context, expected in cases:
+            with self.subTest(context=context):
+                self.assertEqual(_extract_authenticated_user_id({"requestContext": context}), expected)
+        self.assertIsNone(_extract_authenticated_user_id({"requestContext": "not-a-dict"}))
+
+    def test_calendar_token_create_follows_minting_env_between_invocations(self) -> None:
+        store = _MemoryCalendarTokenStore()
+        event = {"httpMethod": "POST", "path": "/calendar/token"}
+        with patch("backend.runtime._calendar_token_store", return_value=store):
+            seeded = self._invoke(
+                event,
+                env={
+                    "DEMO_MODE": "true",
+                    "DEMO_USER_ID": "demo-fallback-user",
+                    "CALENDAR_TOKEN_MINTING_PATH": "env",
+                    "CALENDAR_TOKEN": "seeded-token",
+                    "CALENDAR_TOKEN_USER_ID": "demo-fallback-user",
+                },
+            )
+            minted = self._invoke(event, env={"DEMO_MODE": "true", "DEMO_USER_ID": "demo-fallback-user"})
+            invalid = self._invoke(
+                event,
+                env={"DEMO_MODE": "true", "DEMO_USER_ID": "demo-fallback-user", "CALENDAR_TOKEN_MINTING_PATH": "manual"},
+            )
+
+        self.assertEqual(json.loads(seeded["body"])["token"], "seeded-token")
+        self.assertEqual(minted["statusCode"], 201)
+        self.assertNotEqual(json.loads(minted["body"])["token"], "seeded-token")
+        self.assertEqual(invalid["statusCode"], 400)
+
     def test_calendar_token_create_requires_authenticated_principal_when_demo_mode_disabled(self) -> None:
         response = self._invoke(
             {"httpMethod": "POST", "path": "/calendar/token"},
@@ -743,7 +1182,7 @@ class RuntimeHandlerTests(unittest.TestCase):
         }
 
         with (
-            patch("backend.runtime.fetch_current_user_id", return_value="12345"),
+            patch("backend.canvas_client.fetch_current_user_id", return_value="12345"),
             patch("backend.runtime._upsert_canvas_connection") as upsert,
         ):
             response = self._invoke(event, env={"DEMO_MODE": "true"})
@@ -1028,7 +1467,7 @@ class RuntimeHandlerTests(unittest.TestCase):
                     },
                 ],
             ),
-            patch("backend.runtime._cards_table", return_value=cards_table),
+            self._patch_cards_table(cards_table),
         ):
             response = self._invoke(event, env={"DEMO_MODE": "false"})
 
@@ -1037,6 +1476,7 @@ class RuntimeHandlerTests(unittest.TestCase):
         self.assertIn("card-2", cards_table.rows)
         self.assertEqual(cards_table.rows["card-1"]["entityType"], "Card")
         self.assertEqual(cards_table.rows["card-1"]["courseId"], "course-psych-101")
+        self.assertEqual(cards_table.batch_writer_calls, 1)
 
     def test_generate_flashcards_rejects_non_positive_num_cards(self) -> None:
         event = {
@@ -1528,9 +1968,24 @@ class RuntimeHandlerTests(unittest.TestCase):
         self.assertEqual(body["answer"], generation.GUARDRAIL_BLOCKED_CHAT_ANSWER)
         self.assertEqual(body["citations"], [])
 
+    def test_warmer_ping_returns_before_scheduled_sync(self) -> None:
+        event = {"source": "aws.events", "detail-type": "Warmer Ping"}
+
+        with patch("backend.runtime._list_canvas_connections") as list_connections:
+            response = self._invoke(event, env={"DEMO_MODE": "false"})
+
+        self.assertEqual(response, {"warm": True})
+        list_connections.assert_not_called()
+
     def test_scheduled_canvas_sync_processes_all_connections_and_continues_on_user_failures(self) -> None:
         event = {"source": "aws.events", "detail-type": "Scheduled Event"}
 
+        # Users sync concurrently, so outcomes are keyed by user rather than call order.
+        def sync_assignments(*, user_id, **kwargs):
+            if user_id == "user-2":
+                raise CanvasApiError("invalid token")
+            return 2, 7, ["42"]
+
         with (
             patch(
                 "backend.runtime._list_canvas_connections",
@@ -1549,7 +2004,7 @@ class RuntimeHandlerTests(unittest.TestCase):
             ),
             patch(
                 "backend.runtime._sync_canvas_assignments_for_user",
-                side_effect=[(2, 7, ["42"]), CanvasApiError("invalid token")],
+                side_effect=sync_assignments,
             ),
             patch(
                 "backend.runtime._sync_canvas_materials_for_user",
@@ -1578,6 +2033,63 @@ class RuntimeHandlerTests(unittest.TestCase):
         self.assertEqual(body["failedCourseIdsByUser"]["user-1"], ["42"])
         self.assertIn("user-2", body["userErrors"])
 
+    def test_scheduled_canvas_sync_runs_users_concurrently_in_connection_order(self) -> None:
+        event = {"source": "aws.events", "detail-type": "Scheduled Event"}
+        user_ids = ["user-1", "user-2", "user-3"]
+        # Every user sync must be in flight at once to get past the barrier.
+        barrier = threading.Barrier(len(user_ids), timeout=5)
+
+        def sync_assignments(*, user_id, **kwargs):
+            barrier.wait()
+            if user_id == "user-2":
+                raise CanvasApiError("invalid token")
+            return 1, 1, []
+
+        with (
+            patch(
+                "backend.runtime._list_canvas_connections",
+                return_value=iter(
+                    {"userId": user_id, "canvasBaseUrl": "https://canvas.calpoly.edu", "accessToken": "token"}
+                    for user_id in user_ids
+                ),
+            ),
+            patch("backend.runtime._sync_canvas_assignments_for_user", side_effect=sync_assignments),
+            patch("backend.runtime._sync_canvas_materials_for_user", return_value=(0, 0, [])),
+        ):
+            response = self._invoke(event, env={"DEMO_MODE": "false"})
+
+        body = json.loads(response["body"])
+        self.assertEqual(body["connectionsProcessed"], 3)
+        self.assertEqual(body["usersSucceeded"], 2)
+        self.assertEqual(body["coursesUpserted"], 2)
+        self.assertEqual(list(body["userErrors"]), ["user-2"])
+
+    def test_scheduled_user_sync_workers_use_their_own_boto3_sessions(self) -> None:
+        from backend import runtime
+
+        boto3_stub = MagicMock()
+        boto3_stub.session.Session.side_effect = lambda: MagicMock()
+        barrier = threading.Barrier(2, timeout=5)
+
+        def sync_connection(connection, *, updated_at):
+            barrier.wait()
+            return runtime._dynamodb_table("canvas"), runtime._dynamodb_table("canvas"), runtime._s3_client()
+
+        connections = [{"userId": user_id} for user_id in ("user-1", "user-2")]
+        with (
+            patch.dict("sys.modules", {"boto3": boto3_stub}),
+            patch("backend.runtime._sync_canvas_connection", side_effect=sync_connection),
+        ):
+            results = dict(runtime._iter_scheduled_user_syncs(connections, updated_at="2026-09-01T00:00:00Z"))
+
+        (table_1, table_1_again, s3_1), (table_2, _, s3_2) = results["user-1"], results["user-2"]
+        self.assertIs(table_1, table_1_again)
+        self.assertIsNot(table_1, table_2)
+        self.assertIsNot(s3_1, s3_2)
+        self.assertEqual(boto3_stub.session.Session.call_count, 2)
+        boto3_stub.resource.assert_not_called()
+        boto3_stub.client.assert_not_called()
+
     def test_scheduled_canvas_sync_handles_empty_connection_set(self) -> None:
         event = {"source": "aws.events", "detail-type": "Scheduled Event"}
         with patch("backend.runtime._list_canvas_connections", return_value=[]):
@@ -1609,6 +2121,32 @@ class RuntimeHandlerTests(unittest.TestCase):
             f"https://api.example.test/dev/calendar/{body['token']}.ics",
         )
 
+    def test_calendar_token_feed_url_reads_canonical_case_headers_and_configured_base(self) -> None:
+        store = _MemoryCalendarTokenStore()
+        event = {
+            "httpMethod": "POST",
+            "path": "/calendar/token",
+            "headers": {"Host": "api.example.test", "X-Forwarded-Proto": "http"},
+            "requestContext": {"stage": "dev", "authorizer": {"principalId": "demo-user"}},
+        }
+        with patch("backend.runtime._calendar_token_store", return_value=store):
+            from_headers = self._invoke(event, env={"DEMO_MODE": "false"})
+            configured = self._invoke(
+                event,
+                env={"DEMO_MODE": "false", "PUBLIC_BASE_URL": "https://feeds.example.test/"},
+            )
+
+        header_body = json.loads(from_headers["body"])
+        configured_body = json.loads(configured["body"])
+        self.assertEqual(
+            header_body["feedUrl"],
+            f"http://api.example.test/dev/calendar/{header_body['token']}.ics",
+        )
+        self.assertEqual(
+            configured_body["feedUrl"],
+            f"https://feeds.example.test/calendar/{configured_body['token']}.ics",
+        )
+
     def test_calendar_route_looks_up_token_and_uses_associated_user(self) -> None:
         store = _MemoryCalendarTokenStore()
         store.save(
@@ -1646,6 +2184,103 @@ class RuntimeHandlerTests(unittest.TestCase):
         self.assertIn("SUMMARY:Midterm Exam", response["body"])
         load_items.assert_called_once_with("demo-user")
 
+    def test_ics_payload_without_items_is_an_empty_calendar(self) -> None:
+        from backend import runtime
+
+        self.assertEqual(
+            runtime._build_ics_payload(user_id="user-1", items=[]),
+            "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//GURT//StudyBuddy//EN\r\nEND:VCALENDAR\r\n",
+        )
+
+    def test_ics_payload_keeps_per_course_uid_and_description_lines(self) -> None:
+        from backend import runtime
+
+        items = [
+            {"id": "a1", "courseId": "course;1", "title": "A1", "dueAt": "2026-10-15T17:00:00Z"},
+            {"id": "b1", "courseId": "course-2", "title": "B1", "dueAt": "2026-10-16T17:00:00Z"},
+            {"id": "a2", "courseId": "course;1", "title": "A2", "dueAt": "2026-10-17T17:00:00Z"},
+        ]
+        payload = runtime._build_ics_payload(user_id="user-1", items=items)
+
+        self.assertIn("UID:studybuddy:user-1:course;1:a1\r\n", payload)
+        self.assertIn("UID:studybuddy:user-1:course-2:b1\r\n", payload)
+        self.assertIn("UID:studybuddy:user-1:course;1:a2\r\n", payload)
+        self.assertEqual(payload.count("DESCRIPTION:Course course\\;1\r\n"), 2)
+        self.assertEqual(payload.count("DESCRIPTION:Course course-2\r\n"), 1)
+
+    def test_calendar_token_records_are_cached_per_store(self) -> None:
+        from backend import runtime
+
+        runtime._CALENDAR_TOKEN_CACHE.clear()
+        self.addCleanup(runtime._CALENDAR_TOKEN_CACHE.clear)
+        store = _MemoryCalendarTokenStore()
+        store.save(
+            CalendarTokenRecord.mint(
+                token="calendar-token-cached",
+                user_id="demo-user",
+                created_at="2026-09-01T10:15:00Z",
+            )
+        )
+        event = {
+            "httpMethod": "GET",
+            "path": "/calendar/calendar-token-cached.ics",
+            "pathParameters": {"token": "calendar-token-cached"},
+        }
+
+        with (
+            patch("backend.runtime._calendar_token_store", return_value=store),
+            patch("backend.runtime._load_schedule_items_for_user", return_value=[]),
+            patch.object(store, "get", wraps=store.get) as get,
+        ):
+            first = self._invoke(event, env={"DEMO_MODE": "false"})
+            second = self._invoke(event, env={"DEMO_MODE": "false"})
+            self.assertEqual(get.call_count, 1)
+
+        self.assertEqual(first["statusCode"], 200)
+        self.assertEqual(second["statusCode"], 200)
+
+        # A different store (e.g. another table) never reuses records cached for the first one.
+        with (
+            patch("backend.runtime._calendar_token_store", return_value=_MemoryCalendarTokenStore()),
+            patch("backend.runtime._load_schedule_items_for_user", return_value=[]),
+        ):
+            response = self._invoke(event, env={"DEMO_MODE": "false"})
+        self.assertEqual(response["statusCode"], 404)
+
+    def test_calendar_route_escapes_ics_text_values(self) -> None:
+        store = _MemoryCalendarTokenStore()
+        store.save(
+            CalendarTokenRecord.mint(
+                token="calendar-token-escape",
+                user_id="demo-user",
+                created_at="2026-09-01T10:15:00Z",
+            )
+        )
+        event = {
+            "httpMethod": "GET",
+            "path": "/calendar/calendar-token-escape.ics",
+            "pathParameters": {"token": "calendar-token-escape"},
+        }
+
+        with (
+            patch("backend.runtime._calendar_token_store", return_value=store),
+            patch(
+                "backend.runtime._load_schedule_items_for_user",
+                return_value=[
+                    {
+                        "id": "item-escape",
+                        "courseId": "course-psych-101",
+                        "title": "Essay; draft, part 1\nsee C:\\notes",
+                        "dueAt": "2026-10-15T17:00:00Z",
+                    }
+                ],
+            ),
+        ):
+            response = self._invoke(event, env={"DEMO_MODE": "false"})
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertIn("SUMMARY:Essay\\; draft\\, part 1 see C:\\\\notes\r\n", response["body"])
+
     def test_calendar_route_defaults_zero_duration_events_to_60_minutes(self) -> None:
         store = _MemoryCalendarTokenStore()
         store.save(
@@ -2142,12 +2777,741 @@ class RuntimeHandlerTests(unittest.TestCase):
         event = {"httpMethod": "POST", "path": "/uploads", "body": "{}"}
         delegated_response = {"statusCode": 200, "body": "{}", "headers": {"Content-Type": "application/json"}}
 
-        with patch("backend.runtime.uploads.lambda_handler", return_value=delegated_response) as handler:
+        with patch("backend.uploads.lambda_handler", return_value=delegated_response) as handler:
             response = self._invoke(event)
 
         self.assertEqual(response, delegated_response)
         handler.assert_called_once_with(event, None)
 
+    @contextmanager
+    def _patch_cards_table(self, table):
+        with self._boto3_conditions_stub(), patch("backend.runtime._cards_table", return_value=table):
+            yield table
+
+    def _boto3_conditions_stub(self):
+        boto3_stub = MagicMock()
+        return patch.dict(
+            "sys.modules",
+            {
+                "boto3": boto3_stub,
+                "boto3.dynamodb": boto3_stub.dynamodb,
+                "boto3.dynamodb.conditions": boto3_stub.dynamodb.conditions,
+            },
+        )
+
+    def test_dynamodb_tables_are_reused_across_invocations(self) -> None:
+        from backend import runtime
+
+        runtime._dynamodb_resource.cache_clear()
+        runtime._shared_dynamodb_table.cache_clear()
+        self.addCleanup(runtime._dynamodb_resource.cache_clear)
+        self.addCleanup(runtime._shared_dynamodb_table.cache_clear)
+        boto3_stub = MagicMock()
+        with patch.dict("sys.modules", {"boto3": boto3_stub}):
+            first = runtime._dynamodb_table("cards")
+            second = runtime._dynamodb_table("cards")
+            runtime._dynamodb_table("docs")
+
+        self.assertIs(first, second)
+        boto3_stub.resource.assert_called_once_with("dynamodb")
+        self.assertEqual(boto3_stub.resource.return_value.Table.call_count, 2)
+
+    def test_numeric_env_settings_follow_the_current_environment(self) -> None:
+        from backend.runtime import _chat_citation_url_ttl_seconds, _int_env
+
+        ttl_cases = [
+            ({}, 3600),
+            ({"CHAT_CITATION_URL_TTL_SECONDS": "120"}, 120),
+            ({"CHAT_CITATION_URL_TTL_SECONDS": "5"}, 60),
+            ({"CHAT_CITATION_URL_TTL_SECONDS": "soon"}, 3600),
+        ]
+        for env, expected in ttl_cases:
+            with self.subTest(env=env), patch.dict("os.environ", env, clear=True):
+                self.assertEqual(_chat_citation_url_ttl_seconds(), expected)
+
+        for raw, expected in (("", 5), (" 12 ", 12), ("0", 5), ("-3", 5), ("many", 5)):
+            with self.subTest(raw=raw), patch.dict("os.environ", {"CANVAS_MAX_FILES_PER_COURSE": raw}, clear=True):
+                self.assertEqual(_int_env("CANVAS_MAX_FILES_PER_COURSE", 5), expected)
+
+    def test_allowed_material_content_types_are_normalized(self) -> None:
+        from backend.runtime import _allowed_material_content_types
+
+        self.assertEqual(
+            _allowed_material_content_types(" Application/PDF, ,text/plain "),
+            frozenset({"application/pdf", "text/plain"}),
+        )
+        self.assertEqual(_allowed_material_content_types(""), frozenset())
+
+    def test_aws_client_warm_up_builds_the_shared_dynamodb_resource(self) -> None:
+        from backend import runtime
+
+        runtime._dynamodb_resource.cache_clear()
+        self.addCleanup(runtime._dynamodb_resource.cache_clear)
+        boto3_stub = MagicMock()
+        with patch.dict("sys.modules", {"boto3": boto3_stub}):
+            runtime._warm_aws_clients()
+            warmed = runtime._dynamodb_resource()
+
+        boto3_stub.resource.assert_called_once_with("dynamodb")
+        self.assertIs(warmed, boto3_stub.resource.return_value)
+
+    def test_aws_clients_are_reused_across_invocations(self) -> None:
+        from backend import runtime
+
+        factories = {
+            runtime._shared_s3_client: "s3",
+            runtime._stepfunctions_client: "stepfunctions",
+            runtime._bedrock_agent_client: "bedrock-agent",
+        }
+        for factory in factories:
+            factory.cache_clear()
+            self.addCleanup(factory.cache_clear)
+        boto3_stub = MagicMock()
+        with patch.dict("sys.modules", {"boto3": boto3_stub}):
+            for factory in factories:
+                self.assertIs(factory(), factory())
+            self.assertIs(runtime._s3_client(), runtime._shared_s3_client())
+
+        self.assertEqual(
+            sorted(call.args[0] for call in boto3_stub.client.call_args_list),
+            sorted(factories.values()),
+        )
+
+    def test_canvas_items_for_user_come_from_user_due_index(self) -> None:
+        from backend import runtime
+
+        def item_row(item_id: str, course_id: str, due_at: str) -> dict:
+            return {
+                "entityType": "CanvasItem",
+                "userId": "u1",
+                "id": item_id,
+                "courseId": course_id,
+                "title": f"Item {item_id}",
+                "dueAt": due_at,
+            }
+
+        first_row = item_row("a", "c2", "2026-09-01T10:00:00Z")
+        table = MagicMock()
+        table.query.side_effect = [
+            {
+                "Items": [first_row, {"entityType": "CanvasItem", "userId": "u2"}],
+                "LastEvaluatedKey": {"pk": "p"},
+            },
+            {"Items": [item_row("b", "c1", "2026-09-02T10:00:00Z")]},
+        ]
+        with (
+            self._boto3_conditions_stub(),
+            patch("backend.runtime._dynamodb_table", return_value=table),
+            patch.dict("os.environ", {"CANVAS_DATA_TABLE": "canvas-data"}),
+        ):
+            items = runtime._query_canvas_items_for_user("u1")
+
+        self.assertEqual([item["id"] for item in items], ["a", "b"])
+        self.assertIs(items[0], first_row)
+        self.assertEqual(table.query.call_count, 2)
+        for call in table.query.call_args_list:
+            self.assertEqual(call.kwargs["IndexName"], "gsi2")
+            self.assertIn("dueAt", call.kwargs["ExpressionAttributeNames"].values())
+            self.assertNotIn("pointsPossible", call.kwargs["ExpressionAttributeNames"].values())
+
+    def test_canvas_items_for_user_fall_back_to_course_partitions_without_index(self) -> None:
+        from backend import runtime
+
+        backfilling = RuntimeError("Cannot read from backfilling global secondary index")
+        backfilling.response = {"Error": {"Code": "ValidationException"}}
+
+        def query(**kwargs):
+            if "IndexName" in kwargs:
+                raise backfilling
+            return next(partition_pages)
+
+        partition_pages = iter(
+            [
+                {"Items": [{"entityType": "CanvasCourse", "id": "c1"}]},
+                {
+                    "Items": [
+                        {
+                            "entityType": "CanvasItem",
+                            "userId": "u1",
+                            "id": "late",
+                            "title": "Late",
+                            "dueAt": "2026-09-03T10:00:00Z",
+                        },
+                        {
+                            "entityType": "CanvasItem",
+                            "userId": "u1",
+                            "id": "early",
+                            "title": "Early",
+                            "dueAt": "2026-09-01T10:00:00Z",
+                        },
+                    ]
+                },
+            ]
+        )
+        table = MagicMock()
+        table.query.side_effect = query
+        with (
+            self._boto3_conditions_stub(),
+            patch("backend.runtime._dynamodb_table", return_value=table),
+            patch.dict("os.environ", {"CANVAS_DATA_TABLE": "canvas-data"}),
+            patch("builtins.print") as log,
+        ):
+            items = runtime._query_canvas_items_for_user("u1")
+
+        self.assertEqual([item["id"] for item in items], ["early", "late"])
+        self.assertEqual({item["courseId"] for item in items}, {"c1"})
+        self.assertEqual(log.call_args.args[0], "Canvas user due index unavailable; querying course partitions")
+
+    def test_canvas_items_for_user_propagate_index_errors_other_than_backfill(self) -> None:
+        from backend import runtime
+
+        denied = RuntimeError("not authorized")
+        denied.response = {"Error": {"Code": "AccessDeniedException"}}
+        table = MagicMock()
+        table.query.side_effect = denied
+        with (
+            self._boto3_conditions_stub(),
+            patch("backend.runtime._dynamodb_table", return_value=table),
+            patch.dict("os.environ", {"CANVAS_DATA_TABLE": "canvas-data"}),
+        ):
+            with self.assertRaises(RuntimeError):
+                runtime._query_canvas_items_for_user("u1")
+
+        self.assertEqual(table.query.call_count, 1)
+
+    def test_canvas_items_fallback_orders_items_across_course_partitions(self) -> None:
+        from backend import runtime
+
+        course_ids = ["c1", "c2", "c3"]
+
+        def partition_rows(*, table, pk_value, sk_prefix, projection=None):
+            if sk_prefix == "COURSE#":
+                return iter([{"entityType": "CanvasCourse", "id": course_id} for course_id in course_ids])
+            course_id = pk_value.rsplit("#", 1)[-1]
+            return iter(
+                [
+                    {
+                        "entityType": "CanvasItem",
+                        "userId": "u1",
+                        "id": f"item-{course_id}",
+                        "title": course_id,
+                        "dueAt": f"2026-09-0{4 - course_ids.index(course_id)}T10:00:00Z",
+                    }
+                ]
+            )
+
+        with patch("backend.runtime._iter_canvas_partition_rows", side_effect=partition_rows):
+            items = runtime._query_canvas_items_by_course(table=MagicMock(), user_id="u1")
+
+        self.assertEqual([item["id"] for item in items], ["item-c3", "item-c2", "item-c1"])
+
+    def test_canvas_connections_come_from_sparse_connection_index(self) -> None:
+        from backend import runtime
+
+        connection = {
+            "entityType": "CanvasConnection",
+            "userId": "u1",
+            "canvasBaseUrl": "https://canvas.example.edu",
+            "accessToken": "token-1",
+        }
+        table = MagicMock()
+        table.query.side_effect = [
+            {"Items": [connection], "LastEvaluatedKey": {"pk": "p"}},
+            {"Items": [{**connection, "userId": "u2", "accessToken": ""}]},
+        ]
+        with (
+            self._boto3_conditions_stub(),
+            patch("backend.runtime._dynamodb_table", return_value=table),
+            patch.dict("os.environ", _CONNECTION_INDEX_ENV),
+        ):
+            connections = list(runtime._list_canvas_connections())
+
+        self.assertEqual(
+            connections,
+            [{"userId": "u1", "canvasBaseUrl": "https://canvas.example.edu", "accessToken": "token-1"}],
+        )
+        table.scan.assert_not_called()
+        self.assertEqual(table.query.call_count, 2)
+        for call in table.query.call_args_list:
+            self.assertEqual(call.kwargs["IndexName"], "connectionIndex")
+        self.assertEqual(table.query.call_args.kwargs["ExclusiveStartKey"], {"pk": "p"})
+
+    def test_canvas_connections_are_streamed_page_by_page(self) -> None:
+        from backend import runtime
+
+        def connection(user_id: str) -> dict:
+            return {
+                "entityType": "CanvasConnection",
+                "userId": user_id,
+                "canvasBaseUrl": "https://canvas.example.edu",
+                "accessToken": f"token-{user_id}",
+            }
+
+        table = MagicMock()
+        table.query.side_effect = [
+            {"Items": [connection("u1")], "LastEvaluatedKey": {"pk": "p"}},
+            {"Items": [connection("u2")]},
+        ]
+        with (
+            self._boto3_conditions_stub(),
+            patch("backend.runtime._dynamodb_table", return_value=table),
+            patch.dict("os.environ", _CONNECTION_INDEX_ENV),
+        ):
+            connections = runtime._list_canvas_connections()
+            self.assertEqual(table.query.call_count, 1)
+            self.assertEqual(next(connections)["userId"], "u1")
+            self.assertEqual(table.query.call_count, 1)
+            self.assertEqual([row["userId"] for row in connections], ["u2"])
+
+        self.assertEqual(table.query.call_count, 2)
+
+    def test_canvas_connections_fall_back_to_scan_while_index_backfills(self) -> None:
+        from backend import runtime
+
+        backfilling = RuntimeError("Cannot read from backfilling global secondary index")
+        backfilling.response = {"Error": {"Code": "ValidationException"}}
+        legacy_connection = {
+            "pk": "USER#u1",
+            "sk": "CANVAS_CONNECTION#default",
+            "entityType": "CanvasConnection",
+            "userId": "u1",
+            "canvasBaseUrl": "https://canvas.example.edu",
+            "accessToken": "token-1",
+        }
+        table = MagicMock()
+        table.query.side_effect = backfilling
+        table.scan.side_effect = [
+            {"Items": [{"entityType": "CanvasItem", "userId": "u1"}], "LastEvaluatedKey": {"pk": "p"}},
+            {
+                "Items": [
+                    legacy_connection,
+                    {**legacy_connection, "userId": "u2", "connectionIndexPk": "CanvasConnection"},
+                ]
+            },
+        ]
+        with (
+            self._boto3_conditions_stub(),
+            patch("backend.runtime._dynamodb_table", return_value=table),
+            patch.dict("os.environ", _CONNECTION_INDEX_ENV),
+            patch("builtins.print") as log,
+        ):
+            connections = list(runtime._list_canvas_connections())
+
+        self.assertEqual([row["userId"] for row in connections], ["u1", "u2"])
+        self.assertEqual(table.scan.call_count, 2)
+        self.assertEqual(log.call_args_list[0].args[0], "Canvas connection index unavailable; scanning")
+        # Listing connections stays read-only; scripts/backfill_canvas_connection_index.py tags older rows.
+        table.update_item.assert_not_called()
+
+    def test_canvas_connections_scan_when_no_index_is_configured(self) -> None:
+        from backend import runtime
+
+        table = MagicMock()
+        table.scan.return_value = {"Items": []}
+        with (
+            patch("backend.runtime._dynamodb_table", return_value=table),
+            patch.dict("os.environ", {"CANVAS_DATA_TABLE": "canvas-data"}, clear=True),
+        ):
+            self.assertEqual(list(runtime._list_canvas_connections()), [])
+
+        table.query.assert_not_called()
+        table.scan.assert_called_once_with()
+
+    def test_canvas_connection_index_errors_other_than_backfill_propagate(self) -> None:
+        from backend import runtime
+
+        denied = RuntimeError("not authorized")
+        denied.response = {"Error": {"Code": "AccessDeniedException"}}
+        table = MagicMock()
+        table.query.side_effect = denied
+        with (
+            self._boto3_conditions_stub(),
+            patch("backend.runtime._dynamodb_table", return_value=table),
+            patch.dict("os.environ", _CONNECTION_INDEX_ENV),
+        ):
+            with self.assertRaises(RuntimeError):
+                runtime._list_canvas_connections()
+
+        table.scan.assert_not_called()
+
+    def test_runtime_cards_for_course_query_course_index_in_due_order(self) -> None:
+        from backend import runtime
+
+        def card(card_id: str, due_at: str) -> dict:
+            return {
+                "cardId": card_id,
+                "entityType": "Card",
+                "courseId": "course-1",
+                "topicId": "topic-1",
+                "prompt": "Prompt",
+                "answer": "Answer",
+                "dueAt": due_at,
+            }
+
+        table = MagicMock()
+        table.query.side_effect = [
+            {"Items": [card("b", "2026-09-01T09:00:00Z")], "LastEvaluatedKey": {"cardId": "b"}},
+            {"Items": [card("a", "2026-09-02T09:00:00Z")]},
+        ]
+        with self._patch_cards_table(table):
+            cards = runtime._list_runtime_cards_for_course("course-1")
+
+        self.assertEqual([row["id"] for row in cards], ["b", "a"])
+        table.scan.assert_not_called()
+        for call in table.query.call_args_list:
+            self.assertEqual(call.kwargs["IndexName"], "courseDueAtIndex")
+        self.assertEqual(table.query.call_args.kwargs["ExclusiveStartKey"], {"cardId": "b"})
+
+    def test_runtime_cards_for_course_fall_back_to_sorted_scan_without_index(self) -> None:
+        from backend import runtime
+
+        cards_table = _MemoryCardsTable()
+        for card_id, course_id, due_at in (
+            ("late", "course-1", "2026-09-03T09:00:00Z"),
+            ("other", "course-2", "2026-09-01T09:00:00Z"),
+            ("early", "course-1", "2026-09-02T09:00:00Z"),
+        ):
+            cards_table.put_item(
+                Item={
+                    "cardId": card_id,
+                    "entityType": "Card",
+                    "courseId": course_id,
+                    "topicId": "topic-1",
+                    "prompt": "Prompt",
+                    "answer": "Answer",
+                    "dueAt": due_at,
+                }
+            )
+
+        cards_table.index_ready = False
+        with self._patch_cards_table(cards_table), patch("builtins.print") as print_mock:
+            cards = runtime._list_runtime_cards_for_course("course-1")
+
+        self.assertEqual([row["id"] for row in cards], ["early", "late"])
+        self.assertEqual(print_mock.call_args.args[0], "Cards course index unavailable; scanning")
+
+    def test_runtime_cards_for_course_break_due_at_ties_by_id_on_both_paths(self) -> None:
+        from backend import runtime
+
+        self.addCleanup(runtime._RUNTIME_CARDS_CACHE.clear)
+        cards_table = _MemoryCardsTable()
+        # Generated batches share one dueAt, and the index returns tied rows in no defined order.
+        for card_id in ("card-b", "card-a"):
+            cards_table.put_item(
+                Item={
+                    "cardId": card_id,
+                    "entityType": "Card",
+                    "courseId": "course-1",
+                    "topicId": "topic-1",
+                    "prompt": "Prompt",
+                    "answer": "Answer",
+                    "dueAt": "2026-09-01T09:00:00Z",
+                }
+            )
+
+        for index_ready in (True, False):
+            with self.subTest(index_ready=index_ready):
+                runtime._RUNTIME_CARDS_CACHE.clear()
+                cards_table.index_ready = index_ready
+                with self._patch_cards_table(cards_table), patch("builtins.print"):
+                    cards = runtime._list_runtime_cards_for_course("course-1")
+
+                self.assertEqual([row["id"] for row in cards], ["card-a", "card-b"])
+
+    def test_runtime_cards_for_course_propagate_index_errors_other_than_backfill(self) -> None:
+        from backend import runtime
+
+        runtime._RUNTIME_CARDS_CACHE.clear()
+        self.addCleanup(runtime._RUNTIME_CARDS_CACHE.clear)
+        throttled = Exception("throughput exceeded")
+        throttled.response = {"Error": {"Code": "ProvisionedThroughputExceededException"}}
+        table = MagicMock()
+        table.query.side_effect = throttled
+        with self._patch_cards_table(table):
+            with self.assertRaises(Exception) as raised:
+                runtime._list_runtime_cards_for_course("course-1")
+
+        self.assertIs(raised.exception, throttled)
+        table.scan.assert_not_called()
+
+    def test_runtime_study_mastery_averages_clamped_stability_per_topic(self) -> None:
+        from backend import runtime
+
+        cards_table = _MemoryCardsTable()
+        for card_id, topic_id, due_at, stability in (
+            ("c1", "topic-b", "2000-01-01T00:00:00Z", "4"),
+            ("c2", "topic-b", "2999-01-01T00:00:00Z", "25"),
+            ("c3", "topic-a", "2999-01-01T00:00:00Z", None),
+        ):
+            row = {
+                "cardId": card_id,
+                "entityType": "Card",
+                "courseId": "course-mastery",
+                "topicId": topic_id,
+                "prompt": "Prompt",
+                "answer": "Answer",
+                "dueAt": due_at,
+            }
+            if stability is not None:
+                row["fsrsState"] = {"stability": stability}
+            cards_table.put_item(Item=row)
+
+        with self._patch_cards_table(cards_table):
+            rows = runtime._runtime_study_mastery("course-mastery")
+
+        self.assertEqual(
+            rows,
+            [
+                {"topicId": "topic-a", "courseId": "course-mastery", "masteryLevel": 0.0, "dueCards": 0},
+                {"topicId": "topic-b", "courseId": "course-mastery", "masteryLevel": 0.7, "dueCards": 1},
+            ],
+        )
+
+    def test_safe_numeric_coercion_handles_dynamodb_shapes(self) -> None:
+        from decimal import Decimal
+
+        from backend import runtime
+
+        self.assertEqual(runtime._safe_int(4), 4)
+        self.assertEqual(runtime._safe_int(Decimal("3")), 3)
+        self.assertEqual(runtime._safe_int("12"), 12)
+        self.assertEqual(runtime._safe_int(None, 7), 7)
+        self.assertEqual(runtime._safe_int(float("inf"), 7), 7)
+        self.assertEqual(runtime._safe_float(2.5), 2.5)
+        self.assertEqual(runtime._safe_float(Decimal("1.25")), 1.25)
+        self.assertEqual(runtime._safe_float("bad", 5.0), 5.0)
+        self.assertEqual(runtime._safe_float(None, 1.0), 1.0)
+
+    def test_due_at_keys_compare_chronologically_as_strings(self) -> None:
+        from backend import runtime
+
+        self.assertEqual(runtime._due_at_key("2026-09-01T09:00:00Z"), "2026-09-01T09:00:00Z")
+        self.assertEqual(runtime._due_at_key("2026-09-01T11:30:00+02:00"), "2026-09-01T09:30:00Z")
+        self.assertEqual(runtime._due_at_key("not a timestamp"), runtime._UNPARSEABLE_DUE_AT_KEY)
+        self.assertTrue(runtime._is_due_key(runtime._due_at_key(""), "2026-09-01T09:00:00Z"))
+        self.assertTrue(runtime._is_due_key("2026-09-01T09:00:00Z", "2026-09-01T09:00:00Z"))
+        self.assertFalse(runtime._is_due_key("2026-09-01T09:00:01Z", "2026-09-01T09:00:00Z"))
+
+    def test_cards_table_scan_pages_serially_with_a_course_filter(self) -> None:
+        from backend import runtime
+
+        table = MagicMock()
+        table.scan.side_effect = [
+            {"Items": [{"cardId": "p0"}], "LastEvaluatedKey": {"cardId": "p0"}},
+            {"Items": [{"cardId": "p1"}]},
+        ]
+        rows = list(runtime._iter_cards_table_scan(table, "course-1"))
+
+        self.assertEqual([row["cardId"] for row in rows], ["p0", "p1"])
+        self.assertEqual(table.scan.call_count, 2)
+        for call in table.scan.call_args_list:
+            self.assertEqual(call.kwargs["FilterExpression"], "courseId = :courseId")
+            self.assertEqual(call.kwargs["ExpressionAttributeValues"], {":courseId": "course-1"})
+            self.assertNotIn("Segment", call.kwargs)
+        self.assertEqual(table.scan.call_args.kwargs["ExclusiveStartKey"], {"cardId": "p0"})
+
+    def test_runtime_cards_for_course_are_cached_until_a_card_write(self) -> None:
+        from backend import runtime
+
+        runtime._RUNTIME_CARDS_CACHE.clear()
+        self.addCleanup(runtime._RUNTIME_CARDS_CACHE.clear)
+        cards_table = _MemoryCardsTable()
+        with self._patch_cards_table(cards_table):
+            runtime._persist_generated_cards(
+                [{"id": "c1", "courseId": "course-1", "topicId": "t1", "prompt": "P1", "answer": "A1"}]
+            )
+            with patch.object(cards_table, "query", wraps=cards_table.query) as query:
+                first = runtime._list_runtime_cards_for_course("course-1")
+                second = runtime._list_runtime_cards_for_course("course-1")
+                self.assertEqual(query.call_count, 1)
+
+                runtime._persist_generated_cards(
+                    [{"id": "c2", "courseId": "course-1", "topicId": "t1", "prompt": "P2", "answer": "A2"}]
+                )
+                third = runtime._list_runtime_cards_for_course("course-1")
+                self.assertEqual(query.call_count, 2)
+
+        self.assertEqual([row["id"] for row in first], ["c1"])
+        self.assertEqual(first, second)
+        self.assertEqual(sorted(row["id"] for row in third), ["c1", "c2"])
+
+    def test_runtime_study_mastery_rows_are_reused_until_a_review(self) -> None:
+        from backend import runtime
+
+        runtime._RUNTIME_CARDS_CACHE.clear()
+        self.addCleanup(runtime._RUNTIME_CARDS_CACHE.clear)
+        cards_table = _MemoryCardsTable()
+        with self._patch_cards_table(cards_table):
+            runtime._persist_generated_cards(
+                [{"id": "c1", "courseId": "course-1", "topicId": "t1", "prompt": "P1", "answer": "A1"}]
+            )
+            with patch("backend.runtime._compute_topic_mastery", wraps=runtime._compute_topic_mastery) as compute:
+                first = runtime._runtime_study_mastery("course-1")
+                second = runtime._runtime_study_mastery("course-1")
+                self.assertEqual(compute.call_count, 1)
+
+                runtime._update_card_review_state(
+                    payload={"cardId": "c1", "courseId": "course-1", "rating": 4},
+                    reviewed_at="2026-09-01T09:00:00Z",
+                )
+                third = runtime._runtime_study_mastery("course-1")
+                self.assertEqual(compute.call_count, 2)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first[0]["masteryLevel"], 0.0)
+        self.assertGreater(third[0]["masteryLevel"], 0.0)
+
+    def test_canvas_assignment_sync_fetches_courses_concurrently(self) -> None:
+        from backend import runtime
+
+        courses = [
+            {"id": course_id, "name": course_id, "term": "Fall 2026", "color": "#000000"}
+            for course_id in ("c1", "c2", "c3")
+        ]
+        # Every course fetch must be in flight at once to get past the barrier.
+        barrier = threading.Barrier(len(courses), timeout=5)
+
+        def fetch_assignments(*, base_url, token, course_id, user_agent):
+            barrier.wait()
+            if course_id == "c2":
+                raise CanvasAccessDeniedError("forbidden")
+            if course_id == "c3":
+                raise CanvasApiError("boom")
+            return [
+                {
+                    "id": "a1",
+                    "courseId": course_id,
+                    "title": "Quiz",
+                    "itemType": "quiz",
+                    "dueAt": "2026-09-01T10:00:00Z",
+                    "pointsPossible": 10,
+                }
+            ]
+
+        table = MagicMock()
+        batch = table.batch_writer.return_value.__enter__.return_value
+        with (
+            patch("backend.runtime._canvas_data_table", return_value=table),
+            patch("backend.canvas_client.fetch_active_courses", return_value=courses),
+            patch("backend.canvas_client.fetch_course_assignments", side_effect=fetch_assignments),
+        ):
+            courses_upserted, items_upserted, failed = runtime._sync_canvas_assignments_for_user(
+                user_id="u1",
+                canvas_base_url="https://canvas.example.edu",
+                access_token="token",
+                updated_at="2026-09-01T00:00:00Z",
+            )
+
+        self.assertEqual((courses_upserted, items_upserted, failed), (3, 1, ["c3"]))
+        self.assertEqual(batch.put_item.call_count, 4)
+        table.batch_writer.assert_called_once_with(overwrite_by_pkeys=["pk", "sk"])
+
+    def test_canvas_listings_are_yielded_before_later_courses_finish(self) -> None:
+        from backend import runtime
+        from studybuddy.models.canvas import Course
+
+        courses = [
+            Course(id=course_id, name=course_id, term="Fall 2026", color="#000000") for course_id in ("c1", "c2")
+        ]
+        first_consumed = threading.Event()
+
+        def fetch(*, base_url, token, course_id, user_agent):
+            if course_id == "c2" and not first_consumed.wait(timeout=5):
+                raise AssertionError("c2 finished before c1 was handed to the caller")
+            return [{"courseId": course_id}]
+
+        listings = runtime._iter_canvas_listings_by_course(
+            fetch,
+            courses,
+            base_url="https://canvas.example.edu",
+            token="token",
+            user_agent="test-agent",
+        )
+        first_course, first_payloads, first_error = next(listings)
+        first_consumed.set()
+        remaining = list(listings)
+
+        self.assertEqual((first_course.id, first_payloads, first_error), ("c1", [{"courseId": "c1"}], None))
+        self.assertEqual([(course.id, payloads) for course, payloads, _ in remaining], [("c2", [{"courseId": "c2"}])])
+
+    def test_canvas_material_sync_streams_files_to_s3_and_skips_oversized_bodies(self) -> None:
+        from contextlib import contextmanager
+
+        from backend import runtime
+
+        courses = [{"id": "c1", "name": "Biology", "term": "Fall 2026", "color": "#000000"}]
+
+        def file_payload(file_id: str) -> dict:
+            return {
+                "canvasFileId": file_id,
+                "courseId": "c1",
+                "displayName": f"{file_id}.pdf",
+                "contentType": "application/pdf",
+                "sizeBytes": 8,
+                "updatedAt": "2026-09-01T10:00:00Z",
+                "downloadUrl": f"https://canvas.example.edu/files/{file_id}/download",
+            }
+
+        bodies = {
+            "https://canvas.example.edu/files/small/download": b"pdf-data",
+            "https://canvas.example.edu/files/large/download": b"x" * 64,
+        }
+
+        @contextmanager
+        def open_stream(*, url, token, user_agent):
+            yield io.BytesIO(bodies[url]), "application/pdf"
+
+        uploaded: dict[str, bytes] = {}
+
+        def upload_fileobj(fileobj, bucket, key, ExtraArgs):
+            chunks = []
+            while chunk := fileobj.read(4):
+                chunks.append(chunk)
+            uploaded[key] = b"".join(chunks)
+            self.assertEqual(ExtraArgs["ContentType"], "application/pdf")
+
+        s3_client = MagicMock()
+        s3_client.upload_fileobj.side_effect = upload_fileobj
+        table = MagicMock()
+        batch = table.batch_writer.return_value.__enter__.return_value
+        with (
+            patch.dict("os.environ", {"UPLOADS_BUCKET": "uploads", "CANVAS_MAX_FILE_BYTES": "16"}),
+            patch("backend.runtime._canvas_data_table", return_value=table),
+            patch("backend.runtime._s3_client", return_value=s3_client),
+            patch("backend.canvas_client.fetch_active_courses", return_value=courses),
+            patch("backend.canvas_client.fetch_course_files", return_value=[file_payload("small"), file_payload("large")]),
+            patch("backend.canvas_client.open_file_stream", side_effect=open_stream),
+        ):
+            upserted, mirrored, failed = runtime._sync_canvas_materials_for_user(
+                user_id="u1",
+                canvas_base_url="https://canvas.example.edu",
+                access_token="token",
+                updated_at="2026-09-01T00:00:00Z",
+            )
+
+        self.assertEqual((upserted, mirrored, failed), (1, 1, []))
+        self.assertEqual(list(uploaded.values()), [b"pdf-data"])
+        self.assertEqual(batch.put_item.call_count, 1)
+        s3_client.put_object.assert_not_called()
+
+    def test_canvas_partition_rows_are_yielded_across_pages(self) -> None:
+        from backend import runtime
+
+        table = MagicMock()
+        table.query.side_effect = [
+            {"Items": [{"id": "a"}, "not-a-row"], "LastEvaluatedKey": {"pk": "p", "sk": "s"}},
+            {"Items": [{"id": "b"}]},
+        ]
+        with self._boto3_conditions_stub():
+            rows = runtime._iter_canvas_partition_rows(table=table, pk_value="USER#u1", sk_prefix="COURSE#")
+            first = next(rows)
+            self.assertEqual(table.query.call_count, 1)
+            remaining = list(rows)
+
+        self.assertEqual([first, *remaining], [{"id": "a"}, {"id": "b"}])
+        self.assertEqual(table.query.call_count, 2)
+        self.assertEqual(table.query.call_args.kwargs["ExclusiveStartKey"], {"pk": "p", "sk": "s"})
+
 
 if __name__ == "__main__":
     unittest.main()